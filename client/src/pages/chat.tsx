@@ -216,6 +216,16 @@ const Chat: React.FC = () => {
     }
   };
 
+  // Prefer compressed audio the browser can play, falling back to WAV
+  const ttsAcceptHeader = (): string => {
+    const probe = document.createElement('audio');
+    const playable = [
+      ['audio/ogg', 'audio/ogg; codecs=opus'],
+      ['audio/mpeg', 'audio/mpeg'],
+    ].filter(([, codec]) => probe.canPlayType(codec) !== '').map(([type]) => type);
+    return [...playable, 'audio/wav;q=0.5'].join(', ');
+  };
+
   // Convert text to speech and play
   const playTextToSpeech = async (text: string, messageIndex: number) => {
     try {
@@ -227,6 +237,7 @@ const Chat: React.FC = () => {
 
       const response = await fetch('http://localhost:8000/speech/text-to-speech', {
         method: 'POST',
+        headers: { Accept: ttsAcceptHeader() },
         body: formData
       });
 
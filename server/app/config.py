@@ -1,8 +1,21 @@
 import os
+from typing import List
 from dotenv import load_dotenv
+from app.helpers.audio import AUDIO_FORMATS, FORMAT_ALIASES
 
 load_dotenv()
 
+def _parse_tts_formats(value: str) -> List[str]:
+    """Parse a comma-separated TTS_FORMATS value, failing fast on names AUDIO_FORMATS lacks."""
+    names = [FORMAT_ALIASES.get(name, name) for name in (part.strip().lower() for part in value.split(",")) if name]
+    unknown = [name for name in names if name not in AUDIO_FORMATS]
+    if unknown or not names:
+        raise ValueError(
+            f"TTS_FORMATS must list one or more of {', '.join(AUDIO_FORMATS)}, got '{value}'"
+            + (f" (unknown: {', '.join(unknown)})" if unknown else "")
+        )
+    return list(dict.fromkeys(names))
+
 class Config:
     # 🔹 Course schedule
     SCHEDULE_FILE_PATH = "Course_Schedule.csv"
@@ -15,6 +28,20 @@ class Config:
     AZURE_SPEECH_KEY = os.getenv("AZURE_SPEECH_KEY")
     AZURE_SPEECH_REGION = os.getenv("AZURE_SPEECH_REGION")
     AZURE_SPEECH_ENDPOINT = os.getenv("AZURE_SPEECH_ENDPOINT")
+    SPEECH_POOL_SIZE = int(os.getenv("SPEECH_POOL_SIZE", "4"))  # Pooled synthesizers and concurrent recognitions
+    SPEECH_POOL_WAIT_SECONDS = 2.0  # How long a request waits for a free speech object before a 503
+    AZURE_SPEECH_VOICE = os.getenv("AZURE_SPEECH_VOICE")  # None uses the service default voice
+    TTS_FORMATS = _parse_tts_formats(os.getenv("TTS_FORMATS", "wav,ogg,mp3"))  # Each gets its own synthesizer pool
+    TTS_DEFAULT_FORMAT = "wav" if "wav" in TTS_FORMATS else TTS_FORMATS[0]
+
+    # 🔹 Voice WebSocket
+    VOICE_MAX_SESSIONS = int(os.getenv("VOICE_MAX_SESSIONS", "16"))
+    VOICE_AUDIO_CHUNK_BYTES = 16 * 1024  # Size of binary audio frames sent back to the client
+
+    # 🔹 Text-to-speech cache
+    TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", "files/tts_cache")
+    TTS_CACHE_MEMORY_BYTES = int(os.getenv("TTS_CACHE_MEMORY_BYTES", str(32 * 1024 * 1024)))
+    TTS_CACHE_DISK_BYTES = int(os.getenv("TTS_CACHE_DISK_BYTES", str(512 * 1024 * 1024)))
 
     # 🔹 Retry settings
     RETRY_LIMIT = 2
@@ -22,21 +49,55 @@ class Config:
     MONGO_URI =  os.getenv("MONGO_URI")
     DB_NAME = os.getenv("DB_NAME", "njit_db")
     COLLECTION_NAME = os.getenv("COLLECTION_NAME", "courses")
-    SOURCE_URL = (
+    SOURCE_BASE_URL = os.getenv(
+        "SOURCE_BASE_URL",
         "https://generalssb-prod.ec.njit.edu/"
         "BannerExtensibility/internalPb/virtualDomains.stuRegCrseSchedSectionsExcel"
-        "?MTM%3DdGVybQ%3D%3D=NDA%3DMjAyNTkw&MTg%3DYXR0cg%3D%3D=OTI%3D&NA%3D%3Dc3ViamVjdA%3D%3D=NTU%3DQ1M%3D"
-        "&NTU%3DcHJvZl91Y2lk=NTg%3Dundefined&encoded=true"
     )
     
     # Retry Configuration
     RETRY_LIMIT = 2
     GEMINI_MAX_RETRIES = 3
     GEMINI_MODEL = "gemini-2.5-flash"
+
+    # Gemini Model Routing
+    # Each call site is served by a tier; a tier that times out falls back to another tier
+    GEMINI_MODEL_TIERS = {
+        "fast": {"model": os.getenv("GEMINI_FAST_MODEL", "gemini-2.5-flash-lite"), "timeout": 6.0, "hedge_after": 1.5},
+        "standard": {"model": GEMINI_MODEL, "timeout": 25.0, "hedge_after": 8.0},
+    }
+    GEMINI_CALL_SITE_TIERS = {
+        "validate_answer": "fast",
+        "feedback": "fast",
+        "follow_up_questions": "standard",
+        "first_recommendation": "standard",
+        "next_recommendation": "standard",
+    }
+    GEMINI_DEFAULT_TIER = "standard"
+    GEMINI_TIER_FALLBACK = {"fast": "standard", "standard": "fast"}
+
+    # Hedged requests: fire a second attempt once a call outlives the tier's p95 latency
+    GEMINI_HEDGE_PERCENTILE = 95
+    GEMINI_HEDGE_MIN_SAMPLES = 20  # Use the tier's hedge_after until this many latencies are recorded
+    GEMINI_LATENCY_WINDOW = 200  # Recent latencies kept per tier
+    GEMINI_THREADS = int(os.getenv("GEMINI_THREADS", "32"))
+    GEMINI_HTTP_TIMEOUT_GRACE = 0.5  # HTTP timeout past a call's deadline, so abandoned attempts free their thread
     
     # API Request Configuration
     REQUEST_TIMEOUT = 30
+
+    # Course Sync Configuration
+    SYNC_INTERVAL_SECONDS = int(os.getenv("SYNC_INTERVAL_SECONDS", "0"))  # 0 disables the periodic sync
+    SYNC_JOB_HISTORY = 20  # Finished sync jobs kept for the status endpoint
+    SYNC_TERMS = [t.strip() for t in os.getenv("SYNC_TERMS", "202590").split(",") if t.strip()]  # First term is the one advised on
+    SYNC_SUBJECTS = [s.strip().upper() for s in os.getenv("SYNC_SUBJECTS", "CS,IS,IT,MATH,PHYS,ENGL,COM,YWCC").split(",") if s.strip()]
+    SYNC_MAX_PARALLEL = int(os.getenv("SYNC_MAX_PARALLEL", "8"))
+    SYNC_FETCH_RETRIES = 3
+    COURSE_PROMPT_MAX_SECTIONS = int(os.getenv("COURSE_PROMPT_MAX_SECTIONS", "200"))  # Sections sent to Gemini per prompt
     
+    # Logging Configuration
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+
     # Conversation Configuration
     MAX_CONVERSATION_HISTORY = 20
     MAX_RECENT_MESSAGES = 10
@@ -76,4 +137,18 @@ ADVISOR_QUESTIONS = [
     {"field": "year", "question": "What Student Year are you in? (e.g., Freshman, Junior)"},
     {"field": "time_preference", "question": "What is your preferred time for classes? (e.g., Morning, Evening, Online)"},
     {"field": "career_goals", "question": "What are your primary Career Goals? (e.g., Software Engineer, Cybersecurity, Data Science)"},
+]
+
+# Fixed advisor replies
+CONCLUDING_MESSAGE = "Thank you for the great conversation! Feel free to come back anytime if you need more course recommendations. Good luck with your studies!"
+CONVERSATION_ENDED_MESSAGE = "Our conversation has ended. Would you like to start a new session?"
+CONTINUE_CONVERSATION_MESSAGE = "I'm here to help you with more course recommendations! What would you like to know?"
+
+# Phrases synthesized at startup so they play straight from the TTS cache
+STATIC_SPEECH_PROMPTS = [q["question"] for q in ADVISOR_QUESTIONS] + [
+    CONCLUDING_MESSAGE,
+    CONVERSATION_ENDED_MESSAGE,
+    CONTINUE_CONVERSATION_MESSAGE,
+    "Got it. Moving to the next question.",
+    "I'll skip this for now and move on.",
 ]
\ No newline at end of file
@@ -1,9 +1,11 @@
 import uuid
 import os
+from typing import List, Optional
 from fastapi import UploadFile
 
 
 import subprocess
+from app.helpers.metrics import FFMPEG_SECONDS, observe
 
 def convert_to_pcm_wav(input_path: str, output_path: str):
     # Use ffmpeg to convert audio to 16kHz, 16-bit, mono PCM WAV
@@ -16,7 +18,8 @@ def convert_to_pcm_wav(input_path: str, output_path: str):
         "-sample_fmt", "s16",
         output_path
     ]
-    subprocess.run(command, check=True)
+    with observe("ffmpeg", FFMPEG_SECONDS):
+        subprocess.run(command, check=True)
 
 
 def save_temp_file(upload_file: UploadFile) -> str:
@@ -36,3 +39,61 @@ def delete_temp_file(filename: str) -> None:
     """
     if os.path.exists(filename):
         os.remove(filename)
+
+# Output formats the text-to-speech endpoint can return, using the Azure SDK's encoders
+AUDIO_FORMATS = {
+    "wav": {"sdk_format": "Riff24Khz16BitMonoPcm", "media_type": "audio/wav", "extension": "wav"},
+    "ogg": {"sdk_format": "Ogg24Khz16BitMonoOpus", "media_type": "audio/ogg", "extension": "ogg"},
+    "mp3": {"sdk_format": "Audio24Khz48KBitRateMonoMp3", "media_type": "audio/mpeg", "extension": "mp3"},
+}
+
+FORMAT_ALIASES = {"opus": "ogg", "mpeg": "mp3", "wave": "wav"}
+
+MEDIA_TYPE_FORMATS = {
+    "audio/wav": "wav",
+    "audio/wave": "wav",
+    "audio/x-wav": "wav",
+    "audio/ogg": "ogg",
+    "audio/opus": "ogg",
+    "audio/mpeg": "mp3",
+    "audio/mp3": "mp3",
+}
+
+def negotiate_audio_format(accept: Optional[str], requested: Optional[str], enabled: List[str], default: str) -> Optional[str]:
+    """
+    Pick an output format from an explicit request or the Accept header.
+    Returns None if an explicitly requested format isn't enabled.
+    Falls back to `default`, or the first enabled format if `default` isn't enabled.
+    """
+    if default not in enabled:
+        default = enabled[0]
+
+    if requested:
+        name = requested.strip().lower()
+        name = FORMAT_ALIASES.get(name, name)
+        return name if name in enabled else None
+
+    if not accept:
+        return default
+
+    # Rank media ranges by q value, keeping header order for ties
+    ranges = []
+    for index, part in enumerate(accept.split(",")):
+        media_type, *params = [p.strip() for p in part.split(";")]
+        quality = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            ranges.append((-quality, index, media_type.lower()))
+
+    for _, _, media_type in sorted(ranges):
+        if media_type in ("audio/*", "*/*"):
+            return default
+        name = MEDIA_TYPE_FORMATS.get(media_type)
+        if name in enabled:
+            return name
+    return default
@@ -76,4 +76,37 @@ def normalize_course_data(course: Dict[str, Any]) -> Dict[str, Any]:
         if standard_field not in normalized and standard_field in course:
             normalized[standard_field] = course[standard_field]
     
-    return normalized
\ No newline at end of file
+    return normalized
+def extract_plan_courses(plan_of_study: str) -> List[List[str]]:
+    """Get the course codes named in each year of a plan of study.
+
+    Returns four lists (first to fourth year) of codes like "CS100", in the
+    order the plan lists them.
+    """
+    import re
+    years = ["First Year", "Second Year", "Third Year", "Fourth Year"]
+    courses: List[List[str]] = [[] for _ in years]
+    for line in plan_of_study.splitlines():
+        for idx, year in enumerate(years):
+            if line.startswith(year):
+                for subject, number in re.findall(r'\b([A-Z]{2,4}) (\d{3})\b', line):
+                    code = f"{subject}{number}"
+                    if code not in courses[idx]:
+                        courses[idx].append(code)
+    return courses
+
+def student_year_index(year: Optional[str]) -> Optional[int]:
+    """Map a free-form student year answer to 0-3 (first to fourth year)."""
+    if not year:
+        return None
+    year_lower = year.lower()
+    keywords = [
+        ["freshman", "first", "1st"],
+        ["sophomore", "second", "2nd"],
+        ["junior", "third", "3rd"],
+        ["senior", "fourth", "4th"],
+    ]
+    for idx, words in enumerate(keywords):
+        if any(word in year_lower for word in words):
+            return idx
+    return None
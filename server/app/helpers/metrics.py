@@ -0,0 +1,108 @@
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+from prometheus_client import Counter, Histogram
+
+logger = logging.getLogger(__name__)
+
+# 🔹 Prometheus metrics
+REQUEST_SECONDS = Histogram(
+    "http_request_seconds", "HTTP request latency", ["method", "route", "status"]
+)
+GEMINI_CALL_SECONDS = Histogram(
+    "gemini_call_seconds", "Gemini call latency per attempt", ["call_site", "model"],
+    buckets=(0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 32, 64),
+)
+GEMINI_RETRIES = Counter(
+    "gemini_retries_total", "Gemini calls retried after a failure", ["call_site"]
+)
+GEMINI_TOKENS = Histogram(
+    "gemini_tokens", "Gemini token counts per call", ["call_site", "kind"],
+    buckets=(50, 100, 250, 500, 1000, 2500, 5000, 10000, 25000, 50000, 100000, 250000),
+)
+GEMINI_HEDGES = Counter(
+    "gemini_hedges_total", "Gemini calls that fired a hedged second attempt", ["call_site"]
+)
+GEMINI_FALLBACKS = Counter(
+    "gemini_fallbacks_total", "Gemini calls that timed out and fell back to another tier", ["call_site", "tier"]
+)
+MONGO_QUERY_SECONDS = Histogram(
+    "mongo_query_seconds", "MongoDB operation latency", ["operation"]
+)
+FFMPEG_SECONDS = Histogram(
+    "ffmpeg_conversion_seconds", "ffmpeg audio conversion time"
+)
+AZURE_SPEECH_SECONDS = Histogram(
+    "azure_speech_seconds", "Azure Speech call latency", ["operation"]
+)
+VOICE_TURN_SECONDS = Histogram(
+    "voice_turn_seconds", "Voice pipeline time per turn from final transcript", ["stage"]
+)
+TTS_CACHE_LOOKUPS = Counter(
+    "tts_cache_lookups_total", "Text-to-speech cache lookups by result", ["result"]
+)
+CATALOG_SECONDS = Histogram(
+    "catalog_operation_seconds", "Course catalog load and sync durations", ["operation"],
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+)
+
+
+class RequestTrace:
+    """Stage timings and token counts collected while serving one request."""
+
+    def __init__(self):
+        self.timings: List[Tuple[str, float]] = []
+        self.tokens: Dict[str, int] = {"prompt": 0, "response": 0}
+
+    def server_timing(self, total: float) -> str:
+        """Format the trace as a Server-Timing header value (milliseconds)."""
+        durations: Dict[str, float] = {}
+        for stage, seconds in self.timings:
+            durations[stage] = durations.get(stage, 0.0) + seconds
+        entries = [f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in durations.items()]
+        entries.append(f"total;dur={total * 1000:.1f}")
+        return ", ".join(entries)
+
+
+_current_trace: ContextVar[Optional[RequestTrace]] = ContextVar("request_trace", default=None)
+
+
+def start_trace():
+    """Start collecting a trace for the current context; returns (trace, reset token)."""
+    trace = RequestTrace()
+    return trace, _current_trace.set(trace)
+
+
+def end_trace(token):
+    """Stop collecting the trace started with `start_trace`."""
+    _current_trace.reset(token)
+
+
+@contextmanager
+def observe(stage: str, histogram: Histogram, /, **labels):
+    """Time a block into `histogram` and the current request trace."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        (histogram.labels(**labels) if labels else histogram).observe(elapsed)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.timings.append((stage, elapsed))
+        logger.debug(f"{stage} took {elapsed * 1000:.1f}ms")
+
+
+def record_tokens(call_site: str, prompt_tokens: Optional[int], response_tokens: Optional[int]):
+    """Record Gemini token usage for a call site."""
+    trace = _current_trace.get()
+    if prompt_tokens is not None:
+        GEMINI_TOKENS.labels(call_site=call_site, kind="prompt").observe(prompt_tokens)
+        if trace is not None:
+            trace.tokens["prompt"] += prompt_tokens
+    if response_tokens is not None:
+        GEMINI_TOKENS.labels(call_site=call_site, kind="response").observe(response_tokens)
+        if trace is not None:
+            trace.tokens["response"] += response_tokens
@@ -1,29 +1,45 @@
-from pymongo import MongoClient, UpdateOne
+from pymongo import ASCENDING, MongoClient, UpdateOne
 from app.config import Config
 from pymongo.server_api import ServerApi
+from app.helpers.metrics import MONGO_QUERY_SECONDS, observe
 
 client = MongoClient(Config.MONGO_URI, server_api=ServerApi('1'))
 db = client[Config.DB_NAME]
 collection = db[Config.COLLECTION_NAME]
 
+def ensure_indexes():
+    """Create the indexes course loads rely on; safe to call on every startup."""
+    collection.create_index([("TERM", ASCENDING), ("SUBJECT", ASCENDING)])
+
+def delete_legacy_courses():
+    """Delete courses stored before sections were keyed by term; returns the count removed."""
+    with observe("mongo.delete_many", MONGO_QUERY_SECONDS, operation="delete_many"):
+        return collection.delete_many({"TERM": {"$exists": False}}).deleted_count
+
 def upsert_courses(records):
-    """Upsert course list into MongoDB by CRN."""
+    """Upsert course list into MongoDB by term and CRN."""
     ops = []
     for record in records:
         crn = record.get("CRN")
         if not crn:
             continue
+        # CRNs are only unique within a term
+        doc_id = f"{record['TERM']}:{crn}" if record.get("TERM") else crn
         ops.append(UpdateOne(
-            {"_id": crn},
+            {"_id": doc_id},
             {"$set": record},
             upsert=True
         ))
 
     if ops:
-        collection.bulk_write(ops)
+        with observe("mongo.bulk_write", MONGO_QUERY_SECONDS, operation="bulk_write"):
+            collection.bulk_write(ops, ordered=False)
+    return len(ops)
 
-def get_courses(limit: int = 20):
-    docs = list(collection.find().limit(limit))
+def get_courses(limit: int = 20, query: dict = None):
+    """Get courses matching `query`; a limit of 0 returns every match."""
+    with observe("mongo.find", MONGO_QUERY_SECONDS, operation="find"):
+        docs = list(collection.find(query or {}).limit(limit))
     for d in docs:
         d["_id"] = str(d["_id"])
     return docs
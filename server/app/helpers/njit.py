@@ -0,0 +1,105 @@
+import base64
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+import httpx
+from app.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def _banner_param(salt: str, value: str, encode_value: bool = True) -> str:
+    """Encode a query key/value the way Banner Extensibility expects.
+
+    Banner obfuscates each part as base64(salt) followed by base64(value).
+    """
+    encoded_value = base64.b64encode(value.encode()).decode() if encode_value else value
+    return quote(base64.b64encode(salt.encode()).decode() + encoded_value, safe="")
+
+
+def build_source_url(term: str, subject: str) -> str:
+    """Build the NJIT section export URL for a single term and subject."""
+    params = [
+        (_banner_param("13", "term"), _banner_param("40", term)),
+        (_banner_param("18", "attr"), _banner_param("92", "")),
+        (_banner_param("4", "subject"), _banner_param("55", subject)),
+        (_banner_param("55", "prof_ucid"), _banner_param("58", "undefined", encode_value=False)),
+        ("encoded", "true"),
+    ]
+    return f"{Config.SOURCE_BASE_URL}?" + "&".join(f"{key}={value}" for key, value in params)
+
+
+def fetch_source(client: httpx.Client, term: str, subject: str) -> List[Dict[str, Any]]:
+    """Fetch one term/subject from NJIT, retrying with exponential backoff."""
+    url = build_source_url(term, subject)
+    for attempt in range(Config.SYNC_FETCH_RETRIES):
+        try:
+            resp = client.get(url)
+            if resp.status_code != 200:
+                raise RuntimeError(f"Failed to fetch data from NJIT (HTTP {resp.status_code})")
+
+            try:
+                data = resp.json()
+            except Exception as e:
+                raise RuntimeError(f"Invalid JSON response: {e}")
+
+            if not isinstance(data, list):
+                raise RuntimeError("Expected a list of courses")
+
+            # Tag each section with its partition so the catalog can be split by term and subject
+            for record in data:
+                record["TERM"] = term
+                record["SUBJECT"] = subject
+            return data
+        except Exception as e:
+            if attempt < Config.SYNC_FETCH_RETRIES - 1:
+                wait_time = 2 ** attempt
+                logger.warning(f"Fetching {subject} {term} failed (attempt {attempt + 1}). Retrying in {wait_time}s. Error: {e}")
+                time.sleep(wait_time)
+            else:
+                raise RuntimeError(f"Fetching {subject} {term} failed after {Config.SYNC_FETCH_RETRIES} attempts: {e}")
+    return []
+
+
+def fetch_course_data(
+    terms: Optional[List[str]] = None,
+    subjects: Optional[List[str]] = None,
+    on_source_done: Optional[Callable[[str, int, bool], None]] = None,
+) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """Fetch every term/subject concurrently over a pooled HTTP client.
+
+    `on_source_done(source, record_count, failed)` is called as each source
+    finishes, so callers can report progress. Returns the combined records
+    and the list of sources that failed. Raises if every source failed.
+    """
+    terms = terms or Config.SYNC_TERMS
+    subjects = subjects or Config.SYNC_SUBJECTS
+    sources = [(term, subject) for term in terms for subject in subjects]
+    parallel = max(1, min(Config.SYNC_MAX_PARALLEL, len(sources)))
+
+    limits = httpx.Limits(max_connections=parallel, max_keepalive_connections=parallel)
+    records: List[Dict[str, Any]] = []
+    failed: List[str] = []
+    with httpx.Client(timeout=Config.REQUEST_TIMEOUT, limits=limits) as client:
+        with ThreadPoolExecutor(max_workers=parallel, thread_name_prefix="njit-fetch") as pool:
+            futures = {pool.submit(fetch_source, client, term, subject): (term, subject) for term, subject in sources}
+            for future in as_completed(futures):
+                term, subject = futures[future]
+                source = f"{subject} {term}"
+                try:
+                    source_records = future.result()
+                except Exception as e:
+                    logger.error(str(e))
+                    failed.append(source)
+                    source_records = None
+                else:
+                    records.extend(source_records)
+                if on_source_done is not None:
+                    on_source_done(source, len(source_records or []), source_records is None)
+
+    if sources and len(failed) == len(sources):
+        raise RuntimeError("Failed to fetch data from NJIT for every term and subject")
+    return records, failed
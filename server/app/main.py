@@ -1,7 +1,16 @@
-from fastapi import FastAPI
+import logging
+import time
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from app.routes import courses,speech,advisor
-from app.services import course_service
+from app.config import Config, STATIC_SPEECH_PROMPTS
+from app.helpers import mongo
+from app.helpers.metrics import REQUEST_SECONDS, end_trace, start_trace
+from app.routes import courses,speech,advisor,metrics,voice
+from app.services import course_service, sync_service, speech_service
+
+logging.basicConfig(level=Config.LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+logger = logging.getLogger(__name__)
+
 app = FastAPI(
     title="NJIT Gemini Course Advisor",
     description="Conversational advising for NJIT CS Undergrads."
@@ -13,24 +22,65 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
 
 
+@app.middleware("http")
+async def trace_request(request: Request, call_next):
+    """Time each request and report per-stage timings in a Server-Timing header."""
+    trace, token = start_trace()
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        end_trace(token)
+    elapsed = time.perf_counter() - start
+
+    route = request.scope.get("route")
+    REQUEST_SECONDS.labels(
+        method=request.method,
+        route=route.path if route else "unmatched",
+        status=response.status_code,
+    ).observe(elapsed)
+    response.headers["Server-Timing"] = trace.server_timing(elapsed)
+    return response
+
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize application on startup."""
-    print("Loading and processing course schedule data from MongoDB...")
+    try:
+        mongo.ensure_indexes()
+    except Exception as e:
+        logger.error(f"Could not create MongoDB indexes: {e}")
+
+    logger.info("Loading and processing course schedule data from MongoDB...")
     success = course_service.load_course_data()
     if not success:
-        print("Warning: Course data failed to load from MongoDB.")
+        # An empty or pre-term database: sync now rather than wait for a manual trigger
+        logger.warning("Course data failed to load from MongoDB; starting a sync.")
+        sync_service.start_sync(trigger="startup")
     else:
         course_count = len(course_service.get_courses_json())
-        print(f"Successfully loaded {course_count} courses from MongoDB.")
+        logger.info(f"Successfully loaded {course_count} courses from MongoDB.")
+    sync_service.start_scheduler()
+    speech_service.start()
+    speech_service.start_prewarm(STATIC_SPEECH_PROMPTS)
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background jobs on shutdown."""
+    sync_service.stop()
+    speech_service.stop()
 
 
 # Register routes
 app.include_router(speech.router)
 app.include_router(courses.router)
 app.include_router(advisor.router)
+app.include_router(metrics.router)
+app.include_router(voice.router)
 
 
@@ -0,0 +1,27 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+class SyncJob(BaseModel):
+    job_id: str
+    trigger: str = "manual"  # manual, scheduled, startup
+    status: str = "queued"  # queued, running, succeeded, failed
+    stage: Optional[str] = None  # fetching, upserting, reloading
+
+    # Timings (epoch seconds for timestamps, seconds for durations)
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    fetch_seconds: Optional[float] = None
+    upsert_seconds: Optional[float] = None
+    reload_seconds: Optional[float] = None
+    duration_seconds: Optional[float] = None
+
+    # Counts
+    sources_total: int = 0  # term/subject combinations fetched
+    sources_done: int = 0  # updated as each source finishes, failed or not
+    sources_failed: List[str] = []
+    records_fetched: int = 0
+    records_synced: int = 0
+    courses_loaded: int = 0
+
+    error: Optional[str] = None
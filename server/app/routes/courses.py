@@ -1,35 +1,27 @@
-import requests
 from fastapi import APIRouter, HTTPException
-from app.config import Config
-from app.helpers.mongo import upsert_courses, get_courses
+from app.helpers.mongo import get_courses
+from app.models.sync import SyncJob
+from app.services.sync_service import sync_service
 
 router = APIRouter(prefix="/courses", tags=["courses"])
 
-def fetch_course_data():
-    """Fetch JSON course data from NJIT endpoint."""
-    resp = requests.get(Config.SOURCE_URL, timeout=30)
-    if resp.status_code != 200:
-        raise HTTPException(status_code=resp.status_code, detail="Failed to fetch data from NJIT")
 
-    try:
-        data = resp.json()
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Invalid JSON response: {e}")
+@router.api_route("/sync", methods=["GET", "POST"], response_model=SyncJob, status_code=202)
+def sync_courses():
+    """Start a background sync of NJIT course data into MongoDB.
 
-    if not isinstance(data, list):
-        raise HTTPException(status_code=500, detail="Expected a list of courses")
-    return data
+    Returns the job immediately; poll /courses/sync/{job_id} for progress.
+    """
+    return sync_service.start_sync()
 
 
-@router.get("/sync")
-def sync_courses():
-    """Fetch and upsert NJIT course data into MongoDB."""
-    try:
-        records = fetch_course_data()
-        upsert_courses(records)
-        return {"status": "success", "records_synced": len(records)}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+@router.get("/sync/{job_id}", response_model=SyncJob)
+def sync_status(job_id: str):
+    """Get the status, timings and counts of a sync job."""
+    job = sync_service.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Sync job {job_id} not found")
+    return job
 
 
 @router.get("/")
@@ -0,0 +1,9 @@
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+router = APIRouter(tags=["metrics"])
+
+@router.get("/metrics")
+def metrics():
+    """Prometheus metrics for this process."""
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
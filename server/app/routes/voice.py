@@ -0,0 +1,88 @@
+import asyncio
+import json
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from pydantic import ValidationError
+from app.config import Config
+from app.helpers.audio import negotiate_audio_format
+from app.models.student import StudentState
+from app.routes.advisor import advisor_service
+from app.services.speech_service import speech_service
+from app.services.voice_service import VoiceSession
+
+router = APIRouter(tags=["voice"])
+session_slots = asyncio.Semaphore(Config.VOICE_MAX_SESSIONS)
+
+@router.websocket("/voice/ws")
+async def voice_pipeline(websocket: WebSocket):
+    """
+    Voice conversation over a single WebSocket.
+
+    Client -> server:
+      1. {"type": "start", "state": StudentState, "next_step": str | null, "format": "wav" | "ogg" | "mp3"}
+         (`next_step` is the step the advisor last asked for; null starts the conversation)
+      2. Binary frames of 16kHz 16-bit mono PCM microphone audio
+      3. {"type": "cancel"} to interrupt the reply, {"type": "text", "text": str} for typed input
+
+    Server -> client:
+      {"type": "ready"}, {"type": "transcript"}, {"type": "advisor", "response", "state"},
+      {"type": "audio_start", "media_type", "bytes"}, binary audio chunks, {"type": "audio_end"},
+      {"type": "cancelled"} and {"type": "error", "detail"}
+    """
+    await websocket.accept()
+    if not speech_service.is_configured() or not speech_service.is_ready():
+        await websocket.send_json({"type": "error", "detail": "Azure Speech credentials not configured."})
+        await websocket.close(code=1011)
+        return
+    if session_slots.locked():
+        await websocket.send_json({"type": "error", "detail": "Too many voice sessions. Please try again."})
+        await websocket.close(code=1013)
+        return
+
+    async with session_slots:
+        try:
+            start = await websocket.receive_json()
+            if not isinstance(start, dict):
+                raise ValueError("expected a JSON object")
+            state = StudentState(**start.get("state", {}))
+        except (ValidationError, ValueError, TypeError, KeyError) as e:
+            await websocket.send_json({"type": "error", "detail": f"Invalid start message: {e}"})
+            await websocket.close(code=1003)
+            return
+
+        audio_format = negotiate_audio_format(None, start.get("format"), Config.TTS_FORMATS, Config.TTS_DEFAULT_FORMAT)
+        if audio_format is None:
+            await websocket.send_json({"type": "error", "detail": f"Unsupported audio format '{start.get('format')}'"})
+            await websocket.close(code=1003)
+            return
+
+        session = VoiceSession(
+            state,
+            send_json=websocket.send_json,
+            send_bytes=websocket.send_bytes,
+            advisor=advisor_service,
+            speech=speech_service,
+            audio_format=audio_format,
+            next_step=start.get("next_step"),
+        )
+        try:
+            await session.start()
+            while True:
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+                if message.get("bytes") is not None:
+                    session.feed_audio(message["bytes"])
+                elif message.get("text") is not None:
+                    try:
+                        control = json.loads(message["text"])
+                    except ValueError as e:
+                        await websocket.send_json({"type": "error", "detail": f"Invalid control message: {e}"})
+                        continue
+                    if not isinstance(control, dict):
+                        await websocket.send_json({"type": "error", "detail": "Invalid control message: expected a JSON object"})
+                        continue
+                    await session.handle_control(control)
+        except WebSocketDisconnect:
+            pass
+        finally:
+            await session.close()
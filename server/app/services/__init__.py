@@ -2,11 +2,19 @@ from .advisor_service import AdvisorService
 from .gemini_service import GeminiService
 from .course_service import CourseService, course_service
 from .conversation_service import ConversationService
+from .sync_service import SyncService, sync_service
+from .speech_service import SpeechService, speech_service
+from .voice_service import VoiceSession
 
 __all__ = [
     "AdvisorService", 
     "GeminiService", 
     "CourseService", 
     "course_service", 
-    "ConversationService"
+    "ConversationService",
+    "SyncService",
+    "sync_service",
+    "SpeechService",
+    "speech_service",
+    "VoiceSession"
 ]
\ No newline at end of file
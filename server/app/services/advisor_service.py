@@ -1,11 +1,21 @@
 import json
+import logging
 from typing import Dict
 from app.models.student import StudentState, AdvisorResponse
 from app.services.gemini_service import GeminiService
 from app.services.course_service import course_service
 from app.services.conversation_service import ConversationService
 from app.helpers.data_processing import extract_course_from_text
-from app.config import Config, ADVISOR_QUESTIONS, CS_PLAN_OF_STUDY
+from app.config import (
+    Config,
+    ADVISOR_QUESTIONS,
+    CS_PLAN_OF_STUDY,
+    CONCLUDING_MESSAGE,
+    CONVERSATION_ENDED_MESSAGE,
+    CONTINUE_CONVERSATION_MESSAGE,
+)
+
+logger = logging.getLogger(__name__)
 
 class AdvisorService:
     def __init__(self):
@@ -49,10 +59,10 @@ class AdvisorService:
             f"USER PREFERENCES:\n{preferences_context}\n\n"
             f"COURSES ALREADY RECOMMENDED (MUST NOT REPEAT): {excluded_courses}\n\n"
             f"RECOMMENDATION COUNT: {state.current_recommendation_count}\n\n"
-            f"AVAILABLE COURSES (pick a DIFFERENT course than already recommended):\n{course_service.get_course_data()}"
+            f"AVAILABLE COURSES (pick a DIFFERENT course than already recommended):\n{course_service.get_course_data(state.year)}"
         )
         
-        return await self.gemini_service.call_with_retry(user_prompt, system_instruction)
+        return await self.gemini_service.call_with_retry(user_prompt, system_instruction, call_site="next_recommendation")
 
     async def handle_user_feedback(self, state: StudentState, user_response: str) -> str:
         """Handle user feedback and generate appropriate response"""
@@ -66,7 +76,7 @@ class AdvisorService:
         # Check if user wants to end conversation
         if self.conversation_service.should_end_conversation(user_response):
             state.conversation_phase = "concluded"
-            return "Thank you for the great conversation! Feel free to come back anytime if you need more course recommendations. Good luck with your studies!"
+            return CONCLUDING_MESSAGE
         
         # Check if user wants a new recommendation
         if self.conversation_service.wants_new_recommendation(user_response):
@@ -89,7 +99,7 @@ class AdvisorService:
             f"Student profile: {state.year} {state.major} student interested in {state.career_goals}"
         )
         
-        return await self.gemini_service.call_with_retry(user_prompt, system_instruction)
+        return await self.gemini_service.call_with_retry(user_prompt, system_instruction, call_site="feedback")
 
     async def process_next_step(self, state: StudentState) -> AdvisorResponse:
         """Main method to process the next conversation step."""
@@ -106,7 +116,7 @@ class AdvisorService:
         if state.conversation_phase == "concluded":
             return AdvisorResponse(
                 next_step="complete", 
-                response_text="Our conversation has ended. Would you like to start a new session?"
+                response_text=CONVERSATION_ENDED_MESSAGE
             )
 
         # Handle continuous recommendations phase
@@ -125,7 +135,7 @@ class AdvisorService:
                     
                     if course_found and course_found not in state.recommended_courses:
                         state.recommended_courses.append(course_found)
-                        print(f"Added new course to recommended list: {course_found}")
+                        logger.info(f"Added new course to recommended list: {course_found}")
                     
                 else:
                     # Handle general feedback/questions
@@ -189,9 +199,9 @@ class AdvisorService:
                             f"Acknowledge this confirmation first: '{confirmation_message}'\n\n"
                             f"Student Profile:\nMajor: {state.major}, Year: {state.year}, "
                             f"Time Preference: {state.time_preference}, Career Goals: {state.career_goals}\n\n"
-                            f"Course Data:\n{course_service.get_course_data()}"
+                            f"Course Data:\n{course_service.get_course_data(state.year)}"
                         )
-                        advisor_text_step5 = await self.gemini_service.call_with_retry(user_prompt_step5, system_instruction_step5)
+                        advisor_text_step5 = await self.gemini_service.call_with_retry(user_prompt_step5, system_instruction_step5, call_site="follow_up_questions")
                         return AdvisorResponse(next_step="follow_up_response", response_text=advisor_text_step5)
                     
                     return AdvisorResponse(next_step=next_field, response_text=advisor_reply.strip())
@@ -206,11 +216,10 @@ class AdvisorService:
             user_prompt = (
                 f"Profile:\nMajor: {state.major}, Year: {state.year}, "
                 f"Time Preference: {state.time_preference}, Career Goals: {state.career_goals}\n\n"
-                f"Course Data:\n{course_service.get_course_data()}"
+                f"Course Data:\n{course_service.get_course_data(state.year)}"
             )
 
-            print(course_service.get_course_data())
-            advisor_text = await self.gemini_service.call_with_retry(user_prompt, system_instruction)
+            advisor_text = await self.gemini_service.call_with_retry(user_prompt, system_instruction, call_site="follow_up_questions")
             return AdvisorResponse(next_step="follow_up_response", response_text=advisor_text)
 
         # Step 6: First recommendation and transition to continuous mode
@@ -229,16 +238,16 @@ class AdvisorService:
                 f"STUDENT PROFILE:\nMajor: {state.major}, Year: {state.year}, "
                 f"Time Preference: {state.time_preference}, Career Goals: {state.career_goals}\n"
                 f"Follow-up Answers:\n{state.follow_up_response}\n\n"
-                f"AVAILABLE COURSES:\n{course_service.get_course_data()}"
+                f"AVAILABLE COURSES:\n{course_service.get_course_data(state.year)}"
             )
-            advisor_text = await self.gemini_service.call_with_retry(recommendation_prompt, system_instruction)
+            advisor_text = await self.gemini_service.call_with_retry(recommendation_prompt, system_instruction, call_site="first_recommendation")
             
             # Extract course name from recommendation and add to recommended courses
             course_found = extract_course_from_text(advisor_text)
             
             if course_found and course_found not in state.recommended_courses:
                 state.recommended_courses.append(course_found)
-                print(f"Added course to recommended list: {course_found}")
+                logger.info(f"Added course to recommended list: {course_found}")
             
             # Transition to continuous recommendations phase
             state.conversation_phase = "continuous_recommendations"
@@ -260,7 +269,7 @@ class AdvisorService:
         # Default: Continue conversation
         return AdvisorResponse(
             next_step="continuous_conversation", 
-            response_text="I'm here to help you with more course recommendations! What would you like to know?",
+            response_text=CONTINUE_CONVERSATION_MESSAGE,
             conversation_context={
                 "phase": state.conversation_phase,
                 "recommendation_count": state.current_recommendation_count
@@ -1,8 +1,8 @@
 
 import time
 from typing import Dict, Any
-from app.models.student import StudentState
-from app.config import Config
+from app.models.student import StudentState, AdvisorResponse
+from app.config import Config, ADVISOR_QUESTIONS
 
 class ConversationService:
     
@@ -18,6 +18,25 @@ class ConversationService:
         if len(state.conversation_history) > Config.MAX_CONVERSATION_HISTORY:
             state.conversation_history = state.conversation_history[-Config.MAX_CONVERSATION_HISTORY:]
 
+    @staticmethod
+    def apply_user_answer(state: StudentState, next_step: str, answer: str):
+        """Store an answer in the field the advisor last asked for, as the web client does."""
+        answer_fields = [q["field"] for q in ADVISOR_QUESTIONS] + ["follow_up_response"]
+        if next_step in answer_fields:
+            setattr(state, next_step, answer)
+        else:
+            state.last_user_query = answer
+        ConversationService.update_conversation_history(state, "user", answer)
+
+    @staticmethod
+    def apply_advisor_response(state: StudentState, response: AdvisorResponse):
+        """Merge an advisor response back into the state, as the web client does."""
+        ConversationService.update_conversation_history(state, "advisor", response.response_text)
+        context = response.conversation_context or {}
+        state.conversation_phase = context.get("phase", state.conversation_phase)
+        state.current_recommendation_count = context.get("recommendation_count", state.current_recommendation_count)
+        state.recommended_courses = context.get("recommended_courses", state.recommended_courses)
+
     @staticmethod
     def extract_user_preferences(user_response: str, state: StudentState):
         """Extract preferences from user responses (likes, dislikes, interests)"""
@@ -1,42 +1,75 @@
-from typing import List, Dict, Any
+import heapq
+from typing import List, Dict, Any, Optional, Tuple
 from app.helpers.mongo import get_courses
+from app.helpers.data_processing import extract_plan_courses, student_year_index
+from app.config import Config, CS_PLAN_OF_STUDY
+from app.helpers.metrics import CATALOG_SECONDS, observe
 import logging
 
 logger = logging.getLogger(__name__)
 
+# (term, subject)
+PartitionKey = Tuple[str, str]
+
+# Course codes named in each year of the plan of study, e.g. [["CS100", "MATH111", ...], ...]
+PLAN_COURSES = extract_plan_courses(CS_PLAN_OF_STUDY)
+PLAN_COURSE_CODES = {code for year_courses in PLAN_COURSES for code in year_courses}
+# Subjects in the order the plan first names them, so the major's own subject ranks first
+PLAN_SUBJECTS = list(dict.fromkeys(
+    code.rstrip("0123456789") for year_courses in PLAN_COURSES for code in year_courses
+))
+
 class CourseService:
     def __init__(self):
-        self.course_data = ""
+        self.partitions: Dict[PartitionKey, List[Dict[str, Any]]] = {}
         self.courses_json = []
         self.loaded = False
-    
+        self._course_data_cache: Dict[Tuple[str, Optional[int], int], str] = {}
+
     def load_course_data(self) -> bool:
         """Load course data from MongoDB and format for LLM."""
+        with observe("catalog.load", CATALOG_SECONDS, operation="load"):
+            return self._load_course_data()
+
+    def _load_course_data(self) -> bool:
         try:
-            # Get all courses from MongoDB using your existing helper
-            self.courses_json = get_courses(limit=200)
-            
-            if not self.courses_json:
+            # Get every section for the configured terms
+            courses = get_courses(limit=0, query={"TERM": {"$in": Config.SYNC_TERMS}})
+
+            if not courses:
                 logger.warning("No course data found in database")
                 return False
-            
-            # Format courses for LLM consumption
-            self.course_data = self._format_courses_for_llm(self.courses_json)
-            self.loaded = True
-            
-            logger.info(f"Loaded {len(self.courses_json)} courses from MongoDB")
+
+            self.load_courses(courses)
+            logger.info(f"Loaded {len(courses)} courses in {len(self.partitions)} partitions from MongoDB")
             return True
-            
+
         except Exception as e:
             logger.error(f"Error loading course data from MongoDB: {e}")
-            self.loaded = False
             return False
-    
+
+    def load_courses(self, courses: List[Dict[str, Any]]):
+        """Replace the catalog with `courses`, e.g. records exported from MongoDB."""
+        partitions: Dict[PartitionKey, List[Dict[str, Any]]] = {}
+        for course in courses:
+            partitions.setdefault(self._partition_key(course), []).append(course)
+
+        # Swap in the new catalog in one step so readers never see a partial load
+        self.partitions, self.courses_json = partitions, courses
+        self._course_data_cache = {}
+        self.loaded = True
+
+    @staticmethod
+    def _partition_key(course: Dict[str, Any]) -> PartitionKey:
+        """Get the (term, subject) partition a course belongs to."""
+        subject = course.get("SUBJECT") or str(course.get("COURSE", "")).split(" ")[0]
+        return str(course.get("TERM", "")), subject
+
     def _format_courses_for_llm(self, courses: List[Dict[str, Any]]) -> str:
         """Format course data for LLM consumption."""
         course_list = []
-        
-        for course in courses:  # Limit to avoid token limits
+
+        for course in courses:
             # Use your existing MongoDB course structure
             course_code = course.get("COURSE", "")
             title = course.get("TITLE", "")
@@ -48,24 +81,55 @@ class CourseService:
             crn = course.get("CRN", "")
 
             schedule = f"{days} {times}".strip()
-            
+
             course_str = (
                 f"Course {course_code}, titled {title}. "
                 f"It is taught by {instructor} and is a {delivery_mode} course worth {credits} credits. "
                 f"The schedule is {schedule} with CRN {crn}."
             )
             course_list.append(course_str)
-        
+
         return "\n---\n".join(course_list)
-    
-    def get_course_data(self) -> str:
-        """Get the formatted course data string."""
-        return self.course_data
-    
+
+    def get_course_data(self, year: Optional[str] = None, term: Optional[str] = None, max_sections: Optional[int] = None) -> str:
+        """Get the formatted sections most relevant to a student, bounded for prompts.
+
+        Sections of plan-of-study courses for the student's year come first,
+        then the rest of the plan, then other sections of the term with the
+        plan's subjects first, up to COURSE_PROMPT_MAX_SECTIONS in total.
+        """
+        term = term or Config.SYNC_TERMS[0]
+        year_index = student_year_index(year)
+        max_sections = max_sections or Config.COURSE_PROMPT_MAX_SECTIONS
+        cache_key = (term, year_index, max_sections)
+
+        course_data = self._course_data_cache.get(cache_key)
+        if course_data is None:
+            year_courses = set(PLAN_COURSES[year_index]) if year_index is not None else set()
+            subjects = sorted(
+                {key[1] for key in self.partitions if key[0] == term},
+                key=lambda subject: (PLAN_SUBJECTS.index(subject) if subject in PLAN_SUBJECTS else len(PLAN_SUBJECTS), subject),
+            )
+            ranked = []
+            for subject_rank, subject in enumerate(subjects):
+                for course in self.get_partition(term, subject):
+                    code = str(course.get("COURSE", "")).replace(" ", "")
+                    tier = 0 if code in year_courses else 1 if code in PLAN_COURSE_CODES else 2
+                    ranked.append((tier, subject_rank, code, str(course.get("SECTION", "")), course))
+
+            selected = heapq.nsmallest(max_sections, ranked, key=lambda item: item[:4])
+            course_data = self._format_courses_for_llm([item[-1] for item in selected])
+            self._course_data_cache[cache_key] = course_data
+        return course_data
+
+    def get_partition(self, term: str, subject: str) -> List[Dict[str, Any]]:
+        """Get the raw sections for one term and subject."""
+        return self.partitions.get((term, subject), [])
+
     def get_courses_json(self) -> List[Dict[str, Any]]:
         """Get the raw course data as JSON."""
         return self.courses_json
-    
+
     def is_data_loaded(self) -> bool:
         """Check if course data is loaded."""
         return self.loaded
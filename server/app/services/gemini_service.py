@@ -1,41 +1,168 @@
+import asyncio
+import contextvars
+import functools
+import logging
+import math
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Deque, Dict, Optional
 from fastapi import HTTPException
 from google import genai
 from google.genai import types
 from app.config import Config
+from app.helpers.metrics import (
+    GEMINI_CALL_SECONDS,
+    GEMINI_FALLBACKS,
+    GEMINI_HEDGES,
+    GEMINI_RETRIES,
+    observe,
+    record_tokens,
+)
+
+logger = logging.getLogger(__name__)
 
 class GeminiService:
     def __init__(self):
-        self.client = genai.Client() if not Config.GEMINI_API_KEY else genai.Client(api_key=Config.GEMINI_API_KEY)
-    
+        # Backstop for calls made outside _generate, which sets a per-request timeout
+        longest = max(tier["timeout"] for tier in Config.GEMINI_MODEL_TIERS.values()) + Config.GEMINI_HTTP_TIMEOUT_GRACE
+        http_options = types.HttpOptions(timeout=int(longest * 1000))
+        self.client = (
+            genai.Client(http_options=http_options) if not Config.GEMINI_API_KEY
+            else genai.Client(api_key=Config.GEMINI_API_KEY, http_options=http_options)
+        )
+        # The SDK call blocks, so it runs on its own threads rather than the event loop
+        self._executor = ThreadPoolExecutor(max_workers=Config.GEMINI_THREADS, thread_name_prefix="gemini")
+        self.latencies: Dict[str, Deque[float]] = {
+            tier: deque(maxlen=Config.GEMINI_LATENCY_WINDOW) for tier in Config.GEMINI_MODEL_TIERS
+        }
+
+    def hedge_delay(self, tier: str) -> Optional[float]:
+        """How long to wait before hedging a call on `tier`: its recent p95 latency."""
+        samples = self.latencies[tier]
+        if len(samples) < Config.GEMINI_HEDGE_MIN_SAMPLES:
+            return Config.GEMINI_MODEL_TIERS[tier].get("hedge_after")
+        ordered = sorted(samples)
+        rank = max(1, math.ceil(Config.GEMINI_HEDGE_PERCENTILE / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+    async def _generate(self, model: str, tier: str, prompt: str, system_instruction: str, call_site: str, deadline: float) -> str:
+        """Run one Gemini request on the worker threads, abandoning it at `deadline` (time.monotonic())."""
+        def call():
+            # Time spent queued for a thread counts against the deadline
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"Gemini call at {call_site} waited past its deadline for a thread")
+            # The HTTP timeout frees the thread soon after the caller stops waiting
+            timeout = remaining + Config.GEMINI_HTTP_TIMEOUT_GRACE
+            return self.client.models.generate_content(
+                model=model,
+                contents=[prompt],
+                config=types.GenerateContentConfig(
+                    system_instruction=system_instruction,
+                    http_options=types.HttpOptions(timeout=int(timeout * 1000)),
+                ),
+            )
+
+        # Carry the request trace into the worker thread
+        context = contextvars.copy_context()
+        start = time.perf_counter()
+        try:
+            with observe(f"gemini.{call_site}", GEMINI_CALL_SECONDS, call_site=call_site, model=model):
+                response = await asyncio.get_running_loop().run_in_executor(
+                    self._executor, functools.partial(context.run, call)
+                )
+        except asyncio.CancelledError:
+            # Hedge losers and timed-out attempts took at least this long; leaving them
+            # out would drop exactly the slow calls from the hedge percentile
+            self.latencies[tier].append(time.perf_counter() - start)
+            raise
+        self.latencies[tier].append(time.perf_counter() - start)
+
+        usage = getattr(response, "usage_metadata", None)
+        if usage is not None:
+            record_tokens(call_site, usage.prompt_token_count, usage.candidates_token_count)
+        return response.candidates[0].content.parts[0].text.strip()
+
+    async def _call_tier(self, tier: str, prompt: str, system_instruction: str, call_site: str, model: str = None) -> str:
+        """Call a tier with hedging, raising asyncio.TimeoutError past the tier's timeout.
+
+        If the first attempt hasn't answered after the tier's hedge delay, a
+        second identical attempt is started and whichever succeeds first wins.
+        """
+        settings = Config.GEMINI_MODEL_TIERS[tier]
+        model = model or settings["model"]
+        start = time.monotonic()
+        deadline = start + settings["timeout"]
+        delay = self.hedge_delay(tier)
+        hedge_at = start + delay if delay is not None else None
+
+        pending = {asyncio.create_task(self._generate(model, tier, prompt, system_instruction, call_site, deadline))}
+        last_error: Optional[BaseException] = None
+        try:
+            while pending:
+                now = time.monotonic()
+                if now >= deadline:
+                    raise asyncio.TimeoutError()
+                wake_at = deadline if hedge_at is None else min(deadline, hedge_at)
+                done, pending = await asyncio.wait(pending, timeout=wake_at - now, return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    last_error = task.exception()
+
+                if hedge_at is not None and time.monotonic() >= hedge_at and pending:
+                    GEMINI_HEDGES.labels(call_site=call_site).inc()
+                    logger.info(f"Hedging slow Gemini call at {call_site} on the {tier} tier")
+                    pending.add(asyncio.create_task(self._generate(model, tier, prompt, system_instruction, call_site, deadline)))
+                    hedge_at = None
+            raise last_error
+        finally:
+            # Losers keep their worker thread until the SDK returns; only the result is dropped
+            for task in pending:
+                task.cancel()
+
     async def call_with_retry(
-        self, 
-        prompt: str, 
-        system_instruction: str, 
+        self,
+        prompt: str,
+        system_instruction: str,
         max_retries: int = None,
-        model: str = None
+        model: str = None,
+        call_site: str = "unknown"
     ) -> str:
-        """Handles the Gemini API call with exponential backoff for robustness."""
+        """Handles the Gemini API call with exponential backoff for robustness.
+
+        `call_site` picks the model tier from GEMINI_CALL_SITE_TIERS and labels
+        the metrics for this call. A tier that times out falls back once to
+        GEMINI_TIER_FALLBACK before the attempt counts as failed. `model`
+        overrides the tier's model.
+        """
         max_retries = max_retries or Config.GEMINI_MAX_RETRIES
-        model = model or Config.GEMINI_MODEL
-        
+        tier = Config.GEMINI_CALL_SITE_TIERS.get(call_site, Config.GEMINI_DEFAULT_TIER)
+
         for attempt in range(max_retries):
             try:
-                response = self.client.models.generate_content(
-                    model=model,
-                    contents=[prompt],
-                    config=types.GenerateContentConfig(system_instruction=system_instruction),
-                )
-                return response.candidates[0].content.parts[0].text.strip()
+                try:
+                    return await self._call_tier(tier, prompt, system_instruction, call_site, model)
+                except asyncio.TimeoutError:
+                    fallback = Config.GEMINI_TIER_FALLBACK.get(tier)
+                    if fallback is None:
+                        raise
+                    GEMINI_FALLBACKS.labels(call_site=call_site, tier=fallback).inc()
+                    logger.warning(f"Gemini {tier} tier timed out at {call_site}; falling back to {fallback}")
+                    return await self._call_tier(fallback, prompt, system_instruction, call_site)
             except Exception as e:
+                error = "timed out" if isinstance(e, asyncio.TimeoutError) else str(e)
                 if attempt < max_retries - 1:
                     wait_time = 2 ** attempt
-                    print(f"Gemini API call failed (attempt {attempt + 1}). Retrying in {wait_time}s. Error: {e}")
-                    time.sleep(wait_time)
+                    GEMINI_RETRIES.labels(call_site=call_site).inc()
+                    logger.warning(f"Gemini API call failed at {call_site} (attempt {attempt + 1}). Retrying in {wait_time}s. Error: {error}")
+                    await asyncio.sleep(wait_time)
                 else:
-                    raise HTTPException(status_code=500, detail=f"Gemini API call failed after {max_retries} attempts: {e}")
+                    raise HTTPException(status_code=500, detail=f"Gemini API call failed after {max_retries} attempts: {error}")
         raise HTTPException(status_code=500, detail="Unknown error during Gemini API call.")
-    
+
     async def validate_answer(self, field: str, question: str, answer: str, retries: int) -> str:
         """Uses Gemini to validate the user's answer and generate the next prompt."""
         system_instruction = (
@@ -54,5 +181,5 @@ class GeminiService:
         Student Answer: {answer if answer else "[no response]"}
         Retry Count: {retries}
         """
-        
-        return await self.call_with_retry(user_prompt, system_instruction)
\ No newline at end of file
+
+        return await self.call_with_retry(user_prompt, system_instruction, call_site="validate_answer")
\ No newline at end of file
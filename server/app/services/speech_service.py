@@ -0,0 +1,266 @@
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, List, Optional
+from fastapi import HTTPException
+from app.config import Config
+from app.helpers.audio import AUDIO_FORMATS
+from app.helpers.metrics import AZURE_SPEECH_SECONDS, observe
+from app.services.tts_cache import TTSCache
+
+import azure.cognitiveservices.speech as speechsdk
+
+logger = logging.getLogger(__name__)
+
+class StreamRecognition:
+    """Continuous recognition over a push stream of 16kHz 16-bit mono PCM."""
+
+    def __init__(self, recognizer, stream, service: "SpeechService"):
+        self._recognizer = recognizer
+        self._stream = stream
+        self._service = service
+
+    def write(self, audio: bytes):
+        """Feed a chunk of PCM audio to the recognizer."""
+        self._stream.write(audio)
+
+    async def close(self):
+        """End the audio stream and stop recognition."""
+        self._stream.close()
+        await self._service._run(lambda: self._recognizer.stop_continuous_recognition_async().get())
+
+
+class SpeechService:
+    """Shares Azure Speech SDK objects across requests.
+
+    Synthesizers are created once per output format, pre-connected and
+    handed out from bounded pools. Recognizers are bound to their audio source by the SDK,
+    so they can't be reused; they share one SpeechConfig and are limited
+    to the same number of concurrent slots. All blocking SDK calls run on
+    a dedicated thread pool sized to match, never on the event loop.
+    Synthesized audio is served from a TTSCache when possible.
+    """
+
+    def __init__(self):
+        self.speech_config = None
+        self.cache: Optional[TTSCache] = None
+        self._synthesizers: Optional[Dict[str, asyncio.Queue]] = None
+        self._recognizer_slots: Optional[asyncio.Semaphore] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._prewarm_task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def is_configured() -> bool:
+        """Check if Azure Speech credentials are configured."""
+        return bool(Config.AZURE_SPEECH_KEY and Config.AZURE_SPEECH_ENDPOINT)
+
+    def is_ready(self) -> bool:
+        """Check if the pools have been created."""
+        return self._synthesizers is not None
+
+    def start(self):
+        """Create the SpeechConfigs, the pre-warmed synthesizer pools and the thread pool."""
+        if not self.is_configured() or self.is_ready():
+            return
+
+        pool_size = Config.SPEECH_POOL_SIZE
+        self.speech_config = speechsdk.SpeechConfig(
+            subscription=Config.AZURE_SPEECH_KEY,
+            endpoint=Config.AZURE_SPEECH_ENDPOINT
+        )
+        self.cache = TTSCache()
+        # One thread per pooled synthesizer plus one per recognizer slot
+        self._executor = ThreadPoolExecutor(
+            max_workers=pool_size * (len(Config.TTS_FORMATS) + 1), thread_name_prefix="azure-speech"
+        )
+
+        self._synthesizers = {}
+        for audio_format in Config.TTS_FORMATS:
+            # The output format is fixed when a synthesizer is built, so each format gets its own config
+            synthesis_config = speechsdk.SpeechConfig(
+                subscription=Config.AZURE_SPEECH_KEY,
+                endpoint=Config.AZURE_SPEECH_ENDPOINT
+            )
+            if Config.AZURE_SPEECH_VOICE:
+                synthesis_config.speech_synthesis_voice_name = Config.AZURE_SPEECH_VOICE
+            synthesis_config.set_speech_synthesis_output_format(
+                getattr(speechsdk.SpeechSynthesisOutputFormat, AUDIO_FORMATS[audio_format]["sdk_format"])
+            )
+
+            pool = asyncio.Queue()
+            for _ in range(pool_size):
+                synthesizer = speechsdk.SpeechSynthesizer(speech_config=synthesis_config, audio_config=None)
+                # Open the service connection now so the first request skips the handshake
+                speechsdk.Connection.from_speech_synthesizer(synthesizer).open(True)
+                pool.put_nowait(synthesizer)
+            self._synthesizers[audio_format] = pool
+        self._recognizer_slots = asyncio.Semaphore(pool_size)
+
+        logger.info(
+            f"Azure Speech pool ready with {pool_size} synthesizers per format "
+            f"({', '.join(Config.TTS_FORMATS)}) and {pool_size} recognizer slots"
+        )
+
+    def stop(self):
+        """Shut down the thread pool."""
+        if self._prewarm_task is not None:
+            self._prewarm_task.cancel()
+            self._prewarm_task = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self._synthesizers = None
+        self._recognizer_slots = None
+
+    def ensure_ready(self):
+        """Raise a 503 unless speech is configured and started."""
+        if not self.is_configured():
+            raise HTTPException(status_code=503, detail="Azure Speech credentials not configured.")
+        if not self.is_ready():
+            raise HTTPException(status_code=503, detail="Azure Speech is not initialized.")
+
+    @asynccontextmanager
+    async def _synthesizer(self, audio_format: str):
+        """Borrow a synthesizer for a format, waiting briefly before giving up with a 503.
+
+        Yields the synthesizer and a `run` for its blocking calls (see _lease).
+        """
+        pool = self._synthesizers[audio_format]
+        try:
+            synthesizer = await asyncio.wait_for(pool.get(), Config.SPEECH_POOL_WAIT_SECONDS)
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=503, detail="Speech synthesis is busy. Please try again.")
+        async with self._lease(functools.partial(pool.put_nowait, synthesizer)) as run:
+            yield synthesizer, run
+
+    @asynccontextmanager
+    async def _recognizer_slot(self):
+        """Hold a recognizer slot, waiting briefly before giving up with a 503.
+
+        Yields a `run` for the blocking calls made in the slot (see _lease).
+        """
+        try:
+            await asyncio.wait_for(self._recognizer_slots.acquire(), Config.SPEECH_POOL_WAIT_SECONDS)
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=503, detail="Speech recognition is busy. Please try again.")
+        async with self._lease(self._recognizer_slots.release) as run:
+            yield run
+
+    @asynccontextmanager
+    async def _lease(self, release: Callable[[], None]):
+        """Yield a `run` for blocking SDK calls on a pooled resource, then `release` it.
+
+        A cancelled caller can't stop an SDK call already running on its
+        thread, so the release waits for any such call to finish; the
+        resource is never handed out while still in use.
+        """
+        loop = asyncio.get_running_loop()
+        calls = []
+
+        def run(fn):
+            call = self._executor.submit(fn)
+            calls.append(call)
+            return asyncio.wrap_future(call)
+
+        try:
+            yield run
+        finally:
+            pending = [call for call in calls if not call.done()]
+            if not pending:
+                release()
+            else:
+                remaining = len(pending)
+
+                def finished():
+                    nonlocal remaining
+                    remaining -= 1
+                    if remaining == 0:
+                        release()
+
+                def on_done(_):
+                    # Called from the speech thread
+                    try:
+                        loop.call_soon_threadsafe(finished)
+                    except RuntimeError:
+                        pass  # The loop has closed, and the pools with it
+
+                for call in pending:
+                    call.add_done_callback(on_done)
+
+    async def _run(self, fn):
+        """Run a blocking SDK call on the speech thread pool."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn)
+
+    async def synthesize(self, text: str, audio_format: str = None) -> bytes:
+        """Synthesize text in one of the AUDIO_FORMATS, using the cache when possible."""
+        self.ensure_ready()
+        audio_format = audio_format or Config.TTS_DEFAULT_FORMAT
+        if audio_format not in self._synthesizers:
+            raise HTTPException(status_code=400, detail=f"Audio format '{audio_format}' is not enabled.")
+        key = TTSCache.make_key(text, Config.AZURE_SPEECH_VOICE, AUDIO_FORMATS[audio_format]["sdk_format"])
+        audio = await asyncio.to_thread(self.cache.get, key)
+        if audio is not None:
+            return audio
+
+        async with self._synthesizer(audio_format) as (synthesizer, run):
+            with observe("azure.tts", AZURE_SPEECH_SECONDS, operation="text_to_speech"):
+                result = await run(lambda: synthesizer.speak_text_async(TTSCache.normalize(text)).get())
+
+        if result.reason != speechsdk.ResultReason.SynthesizingAudioCompleted:
+            raise HTTPException(status_code=500, detail="Speech synthesis failed.")
+        await asyncio.to_thread(self.cache.put, key, result.audio_data)
+        return result.audio_data
+
+    def start_prewarm(self, texts: List[str]):
+        """Pre-warm the TTS cache in the background."""
+        if self.is_ready() and self._prewarm_task is None:
+            self._prewarm_task = asyncio.create_task(self.prewarm(texts))
+
+    async def prewarm(self, texts: List[str]):
+        """Synthesize fixed phrases into the cache in every format, one at a time to leave the pools free."""
+        for audio_format in Config.TTS_FORMATS:
+            for text in texts:
+                try:
+                    await self.synthesize(text, audio_format)
+                except HTTPException as e:
+                    logger.warning(f"Could not pre-warm TTS cache for '{text}' ({audio_format}): {e.detail}")
+        logger.info(f"TTS cache pre-warmed with {len(texts)} phrases in {len(Config.TTS_FORMATS)} formats")
+
+    async def recognize_file(self, path: str) -> str:
+        """Recognize a single utterance from a 16kHz mono PCM WAV file."""
+        self.ensure_ready()
+        async with self._recognizer_slot() as run:
+            audio_input = speechsdk.audio.AudioConfig(filename=path)
+            recognizer = speechsdk.SpeechRecognizer(speech_config=self.speech_config, audio_config=audio_input)
+            with observe("azure.stt", AZURE_SPEECH_SECONDS, operation="speech_to_text"):
+                result = await run(lambda: recognizer.recognize_once_async().get())
+
+        if result.reason != speechsdk.ResultReason.RecognizedSpeech:
+            raise HTTPException(status_code=500, detail="Speech recognition failed.")
+        return result.text
+
+    async def open_stream_recognizer(self, on_event: Callable[[str, str], None]) -> StreamRecognition:
+        """Start continuous recognition on a push stream.
+
+        `on_event(kind, text)` is called from SDK threads with kind
+        "recognizing" for partial hypotheses and "recognized" for final
+        transcripts.
+        """
+        self.ensure_ready()
+        stream = speechsdk.audio.PushAudioInputStream()
+        audio_input = speechsdk.audio.AudioConfig(stream=stream)
+        recognizer = speechsdk.SpeechRecognizer(speech_config=self.speech_config, audio_config=audio_input)
+
+        def recognized(evt):
+            if evt.result.reason == speechsdk.ResultReason.RecognizedSpeech:
+                on_event("recognized", evt.result.text)
+
+        recognizer.recognizing.connect(lambda evt: on_event("recognizing", evt.result.text))
+        recognizer.recognized.connect(recognized)
+        await self._run(lambda: recognizer.start_continuous_recognition_async().get())
+        return StreamRecognition(recognizer, stream, self)
+
+# Global instance
+speech_service = SpeechService()
@@ -0,0 +1,134 @@
+import asyncio
+import functools
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from app.config import Config
+from app.helpers.metrics import CATALOG_SECONDS
+from app.helpers.mongo import delete_legacy_courses, upsert_courses
+from app.helpers.njit import fetch_course_data
+from app.models.sync import SyncJob
+from app.services.course_service import course_service
+
+logger = logging.getLogger(__name__)
+
+class SyncService:
+    """Runs NJIT course syncs in the background, one at a time."""
+
+    def __init__(self):
+        self.jobs: "OrderedDict[str, SyncJob]" = OrderedDict()
+        self._jobs_lock = threading.Lock()
+        self._writer_lock = threading.Lock()  # Only one sync may write to MongoDB at a time
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="course-sync")
+        self._current_job_id: Optional[str] = None
+        self._scheduler_task: Optional[asyncio.Task] = None
+
+    def start_sync(self, trigger: str = "manual") -> SyncJob:
+        """Queue a sync job and return it immediately.
+
+        If a sync is already queued or running, that job is returned instead
+        of starting an overlapping one.
+        """
+        with self._jobs_lock:
+            if self._current_job_id is not None:
+                return self.jobs[self._current_job_id]
+
+            job = SyncJob(job_id=uuid.uuid4().hex, trigger=trigger, created_at=time.time())
+            # Track the job only once the worker has taken it (submit raises after stop()).
+            # The job can't clear the current id before we set it, as that needs this lock.
+            self._executor.submit(self._run_job, job)
+            self.jobs[job.job_id] = job
+            self._current_job_id = job.job_id
+            self._trim_history()
+
+        return job
+
+    def get_job(self, job_id: str) -> Optional[SyncJob]:
+        """Get a sync job by id."""
+        with self._jobs_lock:
+            return self.jobs.get(job_id)
+
+    def _trim_history(self):
+        """Drop the oldest finished jobs beyond the configured history size."""
+        finished = [job_id for job_id, job in self.jobs.items() if job.finished_at is not None]
+        for job_id in finished[:max(0, len(self.jobs) - Config.SYNC_JOB_HISTORY)]:
+            del self.jobs[job_id]
+
+    def _run_job(self, job: SyncJob):
+        """Fetch, upsert and reload the catalog, recording progress on the job."""
+        with self._writer_lock:
+            job.status = "running"
+            job.started_at = time.time()
+            job.sources_total = len(Config.SYNC_TERMS) * len(Config.SYNC_SUBJECTS)
+            try:
+                job.stage = "fetching"
+                start = time.perf_counter()
+                records, failed_sources = fetch_course_data(on_source_done=functools.partial(self._record_source, job))
+                job.fetch_seconds = time.perf_counter() - start
+                job.records_fetched = len(records)
+                job.sources_failed = failed_sources
+
+                job.stage = "upserting"
+                start = time.perf_counter()
+                job.records_synced = upsert_courses(records)
+                # Sections synced before the term/CRN keys have no TERM and would never be loaded
+                removed = delete_legacy_courses()
+                if removed:
+                    logger.info(f"Removed {removed} courses stored without a term")
+                job.upsert_seconds = time.perf_counter() - start
+
+                # Refresh the in-memory catalog so advisors see the new data
+                job.stage = "reloading"
+                start = time.perf_counter()
+                if not course_service.load_course_data():
+                    raise RuntimeError("Course data failed to reload from MongoDB")
+                job.reload_seconds = time.perf_counter() - start
+                job.courses_loaded = len(course_service.get_courses_json())
+
+                job.status = "succeeded"
+                job.stage = None
+                logger.info(f"Course sync {job.job_id} synced {job.records_synced} records")
+            except Exception as e:
+                job.status = "failed"
+                job.error = str(e)
+                logger.error(f"Course sync {job.job_id} failed during {job.stage}: {e}")
+            finally:
+                job.finished_at = time.time()
+                job.duration_seconds = job.finished_at - job.started_at
+                CATALOG_SECONDS.labels(operation="sync").observe(job.duration_seconds)
+                with self._jobs_lock:
+                    self._current_job_id = None
+
+    @staticmethod
+    def _record_source(job: SyncJob, source: str, record_count: int, failed: bool):
+        """Update a running job's progress as one term/subject finishes."""
+        job.sources_done += 1
+        job.records_fetched += record_count
+        if failed:
+            job.sources_failed = job.sources_failed + [source]
+
+    async def _schedule_loop(self, interval: int):
+        """Trigger a sync every `interval` seconds."""
+        while True:
+            await asyncio.sleep(interval)
+            self.start_sync(trigger="scheduled")
+
+    def start_scheduler(self):
+        """Start the periodic sync if SYNC_INTERVAL_SECONDS is set."""
+        if Config.SYNC_INTERVAL_SECONDS > 0 and self._scheduler_task is None:
+            self._scheduler_task = asyncio.create_task(self._schedule_loop(Config.SYNC_INTERVAL_SECONDS))
+            logger.info(f"Course sync scheduled every {Config.SYNC_INTERVAL_SECONDS}s")
+
+    def stop(self):
+        """Stop the scheduler and the background worker."""
+        if self._scheduler_task is not None:
+            self._scheduler_task.cancel()
+            self._scheduler_task = None
+        self._executor.shutdown(wait=False)
+
+# Global instance
+sync_service = SyncService()
@@ -0,0 +1,134 @@
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Optional
+from app.config import Config
+from app.helpers.metrics import TTS_CACHE_LOOKUPS
+
+logger = logging.getLogger(__name__)
+
+class TTSCache:
+    """Two-tier LRU cache of synthesized audio.
+
+    Entries are keyed on (normalized text, voice, output format). A small
+    in-memory tier sits in front of a size-capped directory on disk; both
+    evict least recently used entries once over their byte limit.
+    """
+
+    def __init__(self, directory: str = None, memory_bytes: int = None, disk_bytes: int = None):
+        self.directory = directory or Config.TTS_CACHE_DIR
+        self.memory_limit = Config.TTS_CACHE_MEMORY_BYTES if memory_bytes is None else memory_bytes
+        self.disk_limit = Config.TTS_CACHE_DISK_BYTES if disk_bytes is None else disk_bytes
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_size = 0
+        self._disk: "OrderedDict[str, int]" = OrderedDict()  # key -> size, least recently used first
+        self._disk_size = 0
+        self._load_disk_index()
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Collapse whitespace so trivially different strings share an entry."""
+        return " ".join(text.split())
+
+    @classmethod
+    def make_key(cls, text: str, voice: str, output_format: str) -> str:
+        """Content address for a piece of synthesized audio."""
+        payload = "\x00".join([cls.normalize(text), voice or "default", output_format])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.audio")
+
+    def _load_disk_index(self):
+        """Index existing cache files, oldest access first."""
+        os.makedirs(self.directory, exist_ok=True)
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".tmp"):
+                # Left over from a write that never finished
+                os.remove(os.path.join(self.directory, name))
+                continue
+            if not name.endswith(".audio"):
+                continue
+            stat = os.stat(os.path.join(self.directory, name))
+            entries.append((stat.st_mtime, name[:-len(".audio")], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_size += size
+        self._evict_disk()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Get cached audio, promoting disk hits into memory."""
+        with self._lock:
+            audio = self._memory.get(key)
+            if audio is not None:
+                self._memory.move_to_end(key)
+                TTS_CACHE_LOOKUPS.labels(result="memory").inc()
+                return audio
+
+            if key not in self._disk:
+                TTS_CACHE_LOOKUPS.labels(result="miss").inc()
+                return None
+
+            path = self._path(key)
+            try:
+                with open(path, "rb") as f:
+                    audio = f.read()
+                os.utime(path)  # mtime tracks last use so the LRU order survives restarts
+            except OSError as e:
+                logger.warning(f"Dropping unreadable TTS cache entry {key}: {e}")
+                self._disk_size -= self._disk.pop(key)
+                TTS_CACHE_LOOKUPS.labels(result="miss").inc()
+                return None
+
+            self._disk.move_to_end(key)
+            self._put_memory(key, audio)
+            TTS_CACHE_LOOKUPS.labels(result="disk").inc()
+            return audio
+
+    def put(self, key: str, audio: bytes):
+        """Store audio in both tiers."""
+        with self._lock:
+            self._put_memory(key, audio)
+            if key in self._disk or len(audio) > self.disk_limit:
+                return
+            # Write then rename so a crash mid-write never leaves a truncated entry behind
+            tmp_path = None
+            try:
+                fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+                with os.fdopen(fd, "wb") as f:
+                    f.write(audio)
+                os.replace(tmp_path, self._path(key))
+            except OSError as e:
+                logger.warning(f"Could not write TTS cache entry {key}: {e}")
+                if tmp_path is not None and os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                return
+            self._disk[key] = len(audio)
+            self._disk_size += len(audio)
+            self._evict_disk()
+
+    def _put_memory(self, key: str, audio: bytes):
+        if len(audio) > self.memory_limit:
+            return
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return
+        self._memory[key] = audio
+        self._memory_size += len(audio)
+        while self._memory_size > self.memory_limit:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_size -= len(evicted)
+
+    def _evict_disk(self):
+        while self._disk_size > self.disk_limit and self._disk:
+            key, size = self._disk.popitem(last=False)
+            self._disk_size -= size
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
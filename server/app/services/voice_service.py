@@ -0,0 +1,165 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional
+from fastapi import HTTPException
+from app.config import Config
+from app.helpers.audio import AUDIO_FORMATS
+from app.helpers.metrics import VOICE_TURN_SECONDS, observe
+from app.models.student import StudentState
+from app.services.conversation_service import ConversationService
+
+logger = logging.getLogger(__name__)
+
+class VoiceSession:
+    """One voice conversation: streamed audio in, advisor turns and audio out.
+
+    Audio is fed to a continuous recognizer; each final transcript is
+    answered by the advisor and synthesized, and the reply is sent back as
+    JSON events followed by binary audio chunks. Any new speech, or an
+    explicit cancel, interrupts the reply in flight (barge-in).
+
+    Each turn works on a copy of the state, which only replaces `state`
+    once the advisor event is sent. A turn interrupted before then leaves
+    the state untouched, and its transcript is prepended to the next one,
+    so an answer split by a pause is handled as one answer.
+
+    `advisor` needs `process_next_step(state)`, and `speech` needs
+    `open_stream_recognizer(on_event)` and `synthesize(text, audio_format)`,
+    so fakes can stand in for either.
+    """
+
+    def __init__(
+        self,
+        state: StudentState,
+        send_json: Callable[[Dict[str, Any]], Awaitable[None]],
+        send_bytes: Callable[[bytes], Awaitable[None]],
+        advisor,
+        speech,
+        audio_format: str = None,
+        next_step: Optional[str] = None,
+    ):
+        self.state = state
+        self.next_step = next_step
+        self.audio_format = audio_format or Config.TTS_DEFAULT_FORMAT
+        self._send_json = send_json
+        self._send_bytes = send_bytes
+        self._advisor = advisor
+        self._speech = speech
+        self._events: asyncio.Queue = asyncio.Queue()
+        self._recognition = None
+        self._event_task: Optional[asyncio.Task] = None
+        self._turn_task: Optional[asyncio.Task] = None
+        self._uncommitted_text: Optional[str] = None  # Transcript of a turn the client hasn't seen yet
+
+    async def start(self):
+        """Open the recognizer and, for a new conversation, ask the first question."""
+        loop = asyncio.get_running_loop()
+
+        def on_event(kind: str, text: str):
+            # Called from SDK threads
+            loop.call_soon_threadsafe(self._events.put_nowait, (kind, text))
+
+        self._recognition = await self._speech.open_stream_recognizer(on_event)
+        self._event_task = asyncio.create_task(self._consume_events())
+        await self._send_json({"type": "ready", "format": self.audio_format})
+
+        if self.next_step is None:
+            self._start_turn(None)
+
+    def feed_audio(self, audio: bytes):
+        """Pass a chunk of 16kHz 16-bit mono PCM to the recognizer."""
+        if self._recognition is not None:
+            self._recognition.write(audio)
+
+    async def handle_control(self, message: Dict[str, Any]):
+        """Handle a JSON control message from the client."""
+        kind = message.get("type")
+        if kind == "cancel":
+            await self._barge_in()
+            self._uncommitted_text = None
+        elif kind == "text":
+            # Typed input takes the same path as a final transcript
+            await self._events.put(("recognized", message.get("text", "")))
+        else:
+            await self._send_json({"type": "error", "detail": f"Unknown message type '{kind}'"})
+
+    async def close(self):
+        """Stop recognition and any reply in flight."""
+        for task in (self._turn_task, self._event_task):
+            if task is not None:
+                task.cancel()
+        if self._recognition is not None:
+            await self._recognition.close()
+            self._recognition = None
+
+    async def _consume_events(self):
+        while True:
+            kind, text = await self._events.get()
+            if kind == "recognizing":
+                # The student started talking over the reply
+                if text:
+                    await self._barge_in()
+            elif kind == "recognized" and text.strip():
+                await self._barge_in()
+                await self._send_json({"type": "transcript", "text": text})
+                if self._uncommitted_text:
+                    # The interrupted turn never reached the client: answer both parts together
+                    text = f"{self._uncommitted_text} {text}"
+                self._start_turn(text)
+
+    async def _barge_in(self):
+        task = self._turn_task
+        if task is not None and not task.done():
+            task.cancel()
+            # Let the turn unwind so it has either committed or not before the next one starts
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            await self._send_json({"type": "cancelled"})
+
+    def _start_turn(self, text: Optional[str]):
+        self._uncommitted_text = text
+        self._turn_task = asyncio.create_task(self._run_turn(text))
+
+    async def _run_turn(self, text: Optional[str]):
+        state = self.state.model_copy(deep=True)
+        try:
+            with observe("voice.turn", VOICE_TURN_SECONDS, stage="advisor"):
+                if text is not None:
+                    ConversationService.apply_user_answer(state, self.next_step, text)
+                # The advisor writes to the state it is given; like the web client, keep only its response
+                response = await self._advisor.process_next_step(state.model_copy(deep=True))
+                ConversationService.apply_advisor_response(state, response)
+
+            # Commit and tell the client together; a barge-in from here on only stops the audio
+            self.state, self.next_step, self._uncommitted_text = state, response.next_step, None
+            advisor_event = asyncio.ensure_future(self._send_json({
+                "type": "advisor",
+                "response": response.model_dump(mode="json"),
+                "state": state.model_dump(mode="json"),
+            }))
+            try:
+                await asyncio.shield(advisor_event)
+            except asyncio.CancelledError:
+                await advisor_event
+                raise
+
+            with observe("voice.turn", VOICE_TURN_SECONDS, stage="speech"):
+                audio = await self._speech.synthesize(response.response_text, self.audio_format)
+            await self._send_json({
+                "type": "audio_start",
+                "format": self.audio_format,
+                "media_type": AUDIO_FORMATS[self.audio_format]["media_type"],
+                "bytes": len(audio),
+            })
+            for offset in range(0, len(audio), Config.VOICE_AUDIO_CHUNK_BYTES):
+                await self._send_bytes(audio[offset:offset + Config.VOICE_AUDIO_CHUNK_BYTES])
+            await self._send_json({"type": "audio_end"})
+        except asyncio.CancelledError:
+            raise
+        except HTTPException as e:
+            await self._send_json({"type": "error", "detail": e.detail})
+        except Exception as e:
+            logger.exception("Voice turn failed")
+            await self._send_json({"type": "error", "detail": str(e)})
@@ -0,0 +1,286 @@
+"""End-to-end conversation benchmark against local stand-ins.
+
+Drives full advisor conversations through the FastAPI app (in process, via
+httpx's ASGI transport) with Gemini, MongoDB and Azure Speech replaced by
+the fakes in `benchmarks.fakes`, and prints a JSON report that can be
+diffed between commits.
+
+Usage (from the server/ directory):
+
+    python -m benchmarks.conversations --sizes 200,2000,20000 \
+        --conversations 50 --concurrency 10 --gemini-latency 0.2 --output bench.json
+"""
+import argparse
+import asyncio
+import atexit
+import importlib
+import json
+import math
+import os
+import resource
+import shutil
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Dict, List
+
+# The app reads credentials at import time; give it placeholders so nothing real is contacted
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+os.environ.setdefault("AZURE_SPEECH_KEY", "benchmark")
+os.environ.setdefault("AZURE_SPEECH_ENDPOINT", "https://localhost.invalid/")
+
+import httpx
+
+from app.config import Config
+from app.helpers import mongo
+from app.main import app
+from app.models.student import AdvisorResponse, StudentState
+from app.routes import advisor, speech
+from app.services.speech_service import speech_service
+from app.services.conversation_service import ConversationService
+from app.services.course_service import course_service
+from benchmarks.fakes import (
+    FAKE_WAV,
+    FakeGeminiClient,
+    current_phase,
+    fake_convert_to_pcm_wav,
+    make_catalog,
+    make_collection,
+    make_speech_sdk,
+)
+
+# Answers keyed by the step the advisor is asking for
+SCRIPTED_ANSWERS = {
+    "year": "I am a freshman",
+    "time_preference": "Mornings please",
+    "career_goals": "Software engineering",
+    "follow_up_response": "I enjoy programming, want about 15 credits, and labs are fine",
+}
+
+# Free-form turns once recommendations start
+FOLLOW_UP_QUERIES = [
+    "Can you suggest another course?",
+    "That sounds interesting, is it a hard class?",
+    "What else is there?",
+    "That's all, goodbye",
+]
+
+MAX_TURNS = 20
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    return {
+        "count": len(values),
+        "mean": sum(values) / len(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": max(values),
+    }
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.requests = 0
+
+    def record(self, phase: str, seconds: float):
+        self.latencies.setdefault(phase, []).append(seconds)
+
+    async def timed(self, phase: str, request) -> httpx.Response:
+        start = time.perf_counter()
+        response = await request
+        self.record(phase, time.perf_counter() - start)
+        self.requests += 1
+        response.raise_for_status()
+        return response
+
+
+def install_fakes(args) -> FakeGeminiClient:
+    """Swap Gemini and Azure Speech for local fakes."""
+    responses = None
+    if args.gemini_responses:
+        with open(args.gemini_responses) as f:
+            responses = json.load(f)
+    gemini = FakeGeminiClient(
+        latency=args.gemini_latency,
+        jitter=args.gemini_jitter,
+        responses=responses,
+        slow_rate=args.gemini_slow_rate,
+        slow_latency=args.gemini_slow_latency,
+    )
+    advisor.advisor_service.gemini_service.client = gemini
+
+    # `app.services` re-exports the instance under the module's name, so fetch the module itself
+    importlib.import_module("app.services.speech_service").speechsdk = make_speech_sdk(latency=args.speech_latency)
+    speech.convert_to_pcm_wav = fake_convert_to_pcm_wav
+    # A fresh cache per run, so runs measure synthesis and leave the working tree alone
+    Config.TTS_CACHE_DIR = tempfile.mkdtemp(prefix="benchmark-tts-cache-")
+    atexit.register(shutil.rmtree, Config.TTS_CACHE_DIR, ignore_errors=True)
+    speech_service.start()
+    return gemini
+
+
+def load_catalog(size: int):
+    """Seed a fresh mongomock collection and reload the in-memory catalog."""
+    mongo.collection = make_collection()
+    mongo.upsert_courses(make_catalog(size, Config.SYNC_TERMS[0], Config.SYNC_SUBJECTS))
+    if not course_service.load_course_data():
+        raise RuntimeError("Failed to load the synthetic catalog")
+
+
+async def run_conversation(client: httpx.AsyncClient, conversation_id: str, recorder: Recorder, with_speech: bool):
+    state = StudentState(session_id=conversation_id)
+    follow_ups = iter(FOLLOW_UP_QUERIES)
+    next_step = "start"
+    started = time.perf_counter()
+
+    for _ in range(MAX_TURNS):
+        if next_step != "start":
+            answer = SCRIPTED_ANSWERS.get(next_step) or next(follow_ups, None)
+            if answer is None:
+                break
+            if with_speech:
+                await recorder.timed("speech_to_text", client.post(
+                    "/speech/speech-to-text", files={"file": ("turn.wav", FAKE_WAV, "audio/wav")}
+                ))
+            ConversationService.apply_user_answer(state, next_step, answer)
+
+        token = current_phase.set(next_step)
+        try:
+            resp = await recorder.timed(next_step, client.post("/advise/next_step", json=state.model_dump(mode="json")))
+        finally:
+            current_phase.reset(token)
+
+        response = AdvisorResponse(**resp.json())
+        ConversationService.apply_advisor_response(state, response)
+
+        if with_speech:
+            await recorder.timed("text_to_speech", client.post(
+                "/speech/text-to-speech", data={"text": response.response_text}
+            ))
+
+        if response.next_step == "complete":
+            break
+        next_step = response.next_step
+
+    recorder.record("conversation", time.perf_counter() - started)
+
+
+async def run_size(size: int, args, gemini: FakeGeminiClient) -> Dict[str, Any]:
+    load_catalog(size)
+    gemini.calls.clear()
+    recorder = Recorder()
+    if args.tracemalloc:
+        tracemalloc.reset_peak()
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async def bounded(i: int):
+        async with semaphore:
+            await run_conversation(client, f"bench-{size}-{i}", recorder, args.speech)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(bounded(i) for i in range(args.conversations)))
+        wall = time.perf_counter() - started
+
+    prompts: Dict[str, Dict[str, float]] = {}
+    for phase in sorted({call["phase"] for call in gemini.calls}):
+        calls = [call for call in gemini.calls if call["phase"] == phase]
+        prompts[phase] = {
+            "calls": len(calls),
+            "mean_chars": sum(c["prompt_chars"] for c in calls) / len(calls),
+            "max_chars": max(c["prompt_chars"] for c in calls),
+            "mean_prompt_tokens": sum(c["prompt_tokens"] for c in calls) / len(calls),
+            "mean_response_tokens": sum(c["response_tokens"] for c in calls) / len(calls),
+        }
+
+    memory = {"peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}
+    if args.tracemalloc:
+        memory["tracemalloc_peak_mb"] = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+
+    return {
+        "catalog_size": size,
+        "courses_loaded": len(course_service.get_courses_json()),
+        "conversations": args.conversations,
+        "concurrency": args.concurrency,
+        "wall_seconds": wall,
+        "throughput": {
+            "conversations_per_second": args.conversations / wall,
+            "requests_per_second": recorder.requests / wall,
+        },
+        "latency": {phase: summarize(values) for phase, values in sorted(recorder.latencies.items())},
+        "prompts": prompts,
+        "memory": memory,
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+async def main(args) -> Dict[str, Any]:
+    gemini = install_fakes(args)
+    if args.tracemalloc:
+        tracemalloc.start()
+
+    runs = []
+    # Ascending sizes so peak RSS grows monotonically with the catalog
+    for size in sorted(int(s) for s in args.sizes.split(",")):
+        runs.append(await run_size(size, args, gemini))
+
+    return {
+        "commit": git_commit(),
+        "config": {
+            "gemini_latency": args.gemini_latency,
+            "gemini_jitter": args.gemini_jitter,
+            "gemini_slow_rate": args.gemini_slow_rate,
+            "gemini_slow_latency": args.gemini_slow_latency,
+            "speech": args.speech,
+            "speech_latency": args.speech_latency,
+        },
+        "runs": runs,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="200,2000,20000", help="Comma-separated catalog sizes (sections)")
+    parser.add_argument("--conversations", type=int, default=50, help="Conversations per catalog size")
+    parser.add_argument("--concurrency", type=int, default=10, help="Conversations in flight at once")
+    parser.add_argument("--gemini-latency", type=float, default=0.0, help="Fake Gemini latency per call (s)")
+    parser.add_argument("--gemini-jitter", type=float, default=0.0, help="Uniform +/- jitter on Gemini latency (s)")
+    parser.add_argument("--gemini-slow-rate", type=float, default=0.0, help="Fraction of Gemini calls that are slow")
+    parser.add_argument("--gemini-slow-latency", type=float, default=10.0, help="Latency of a slow Gemini call (s)")
+    parser.add_argument("--gemini-responses", help="JSON file mapping system-instruction substrings to replies")
+    parser.add_argument("--speech", action="store_true", help="Add speech-to-text and text-to-speech to every turn")
+    parser.add_argument("--speech-latency", type=float, default=0.0, help="Fake Azure Speech latency per call (s)")
+    parser.add_argument("--tracemalloc", action="store_true", help="Also report the traced Python heap peak (slower)")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    report = asyncio.run(main(args))
+    output = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
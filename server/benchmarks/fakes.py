@@ -0,0 +1,264 @@
+"""Local stand-ins for Gemini, MongoDB and Azure Speech used by the benchmarks."""
+import contextvars
+import random
+import time
+import types
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+import mongomock
+
+# Set by the benchmark driver so fake calls can be attributed to a conversation phase
+current_phase: contextvars.ContextVar[str] = contextvars.ContextVar("current_phase", default="unknown")
+
+DAYS = ["MW", "TR", "F", "MWF", "S"]
+TIMES = ["8:30 AM - 9:50 AM", "10:00 AM - 11:20 AM", "1:00 PM - 2:20 PM", "6:00 PM - 9:05 PM"]
+METHODS = ["Face-to-Face", "Online", "Hybrid"]
+
+
+def make_catalog(size: int, term: str, subjects: List[str], seed: int = 0) -> List[Dict[str, Any]]:
+    """Build `size` synthetic sections spread across `subjects`."""
+    rng = random.Random(seed)
+    records = []
+    for i in range(size):
+        subject = subjects[i % len(subjects)]
+        number = 100 + (i // len(subjects)) % 400
+        records.append({
+            "TERM": term,
+            "SUBJECT": subject,
+            "COURSE": f"{subject} {number}",
+            "TITLE": f"Synthetic {subject} Topics {number}",
+            "SECTION": f"{(i // (len(subjects) * 400)) + 1:03d}",
+            "CRN": str(10000 + i),
+            "INSTRUCTOR": f"Instructor {rng.randint(1, 500)}",
+            "INSTRUCTION_METHOD": rng.choice(METHODS),
+            "CREDITS": rng.choice([1, 3, 4]),
+            "DAYS": rng.choice(DAYS),
+            "TIMES": rng.choice(TIMES),
+        })
+    return records
+
+
+def make_collection():
+    """Create an empty in-memory mongomock collection."""
+    return mongomock.MongoClient().db.courses
+
+
+class FakeGeminiClient:
+    """Mimics `genai.Client` with configurable latency and canned outputs.
+
+    `responses` maps a substring of the system instruction to the reply
+    text; the first match wins, otherwise a generic reply is used.
+    `slow_rate` of the calls take `slow_latency` instead, to exercise
+    hedging and tier fallback.
+    """
+
+    DEFAULT_RESPONSES = {
+        "confirm the student's answer": "Got it. Moving to the next question.",
+        "follow-up questions": "Great choices. Which topics excite you most, how many credits do you want, and do you prefer labs?",
+        "student just gave you feedback": "Thanks for sharing that. Would you like another recommendation?",
+    }
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        responses: Optional[Dict[str, str]] = None,
+        seed: int = 0,
+        slow_rate: float = 0.0,
+        slow_latency: float = 0.0,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.responses = {**self.DEFAULT_RESPONSES, **(responses or {})}
+        self.calls: List[Dict[str, Any]] = []
+        self._rng = random.Random(seed)
+        self._recommendations = 0
+        self.models = types.SimpleNamespace(generate_content=self.generate_content)
+
+    def _reply(self, system_instruction: str) -> str:
+        lowered = system_instruction.lower()
+        for needle, text in self.responses.items():
+            if needle.lower() in lowered:
+                return text
+        # Recommendation prompts: name a different course each time
+        self._recommendations += 1
+        number = 100 + self._recommendations % 400
+        return (
+            f"I recommend Course CS {number}, titled Synthetic CS Topics {number}, with CRN {10000 + number}. "
+            "It fits your schedule well. Would you like more recommendations?"
+        )
+
+    def generate_content(self, model: str, contents: List[str], config: Any = None):
+        prompt = contents[0]
+        system_instruction = getattr(config, "system_instruction", "") or ""
+        delay = self.latency + (self._rng.uniform(-self.jitter, self.jitter) if self.jitter else 0.0)
+        if self.slow_rate and self._rng.random() < self.slow_rate:
+            delay = self.slow_latency
+        # Honor the per-request HTTP timeout like the real client does
+        http_options = getattr(config, "http_options", None)
+        timeout = http_options.timeout / 1000 if http_options is not None and http_options.timeout else None
+        if timeout is not None and delay > timeout:
+            time.sleep(timeout)
+            raise TimeoutError("Fake Gemini request timed out")
+        if delay > 0:
+            time.sleep(delay)
+
+        text = self._reply(system_instruction)
+        prompt_tokens = (len(prompt) + len(system_instruction)) // 4
+        response_tokens = len(text) // 4
+        self.calls.append({
+            "phase": current_phase.get(),
+            "model": model,
+            "prompt_chars": len(prompt) + len(system_instruction),
+            "prompt_tokens": prompt_tokens,
+            "response_tokens": response_tokens,
+            "latency": delay,
+        })
+
+        return types.SimpleNamespace(
+            candidates=[types.SimpleNamespace(content=types.SimpleNamespace(parts=[types.SimpleNamespace(text=text)]))],
+            usage_metadata=types.SimpleNamespace(prompt_token_count=prompt_tokens, candidates_token_count=response_tokens),
+        )
+
+
+class _OutputFormat(Enum):
+    Riff24Khz16BitMonoPcm = 1
+    Ogg24Khz16BitMonoOpus = 2
+    Audio24Khz48KBitRateMonoMp3 = 3
+
+
+class _ResultReason(Enum):
+    RecognizingSpeech = 2
+    RecognizedSpeech = 3
+    SynthesizingAudioCompleted = 10
+
+
+# Minimal RIFF/WAVE header followed by silence
+FAKE_WAV = (
+    b"RIFF" + (36 + 3200).to_bytes(4, "little") + b"WAVEfmt " + (16).to_bytes(4, "little")
+    + (1).to_bytes(2, "little") + (1).to_bytes(2, "little") + (16000).to_bytes(4, "little")
+    + (32000).to_bytes(4, "little") + (2).to_bytes(2, "little") + (16).to_bytes(2, "little")
+    + b"data" + (3200).to_bytes(4, "little") + b"\x00" * 3200
+)
+
+
+def make_speech_sdk(latency: float = 0.0, transcript: str = "I am a freshman"):
+    """Build a stand-in for `azure.cognitiveservices.speech` with fixed latency.
+
+    Streaming recognition treats each chunk written to a push stream as
+    UTF-8 text and reports it as a partial and then a final transcript.
+    """
+
+    class SpeechConfig:
+        def __init__(self, subscription=None, endpoint=None, region=None):
+            self.subscription = subscription
+            self.endpoint = endpoint
+            self.speech_synthesis_voice_name = None
+            self.output_format = None
+
+        def set_speech_synthesis_output_format(self, output_format):
+            self.output_format = output_format
+
+    class AudioOutputConfig:
+        def __init__(self, filename=None, use_default_speaker=False):
+            self.filename = filename
+
+    class AudioConfig:
+        def __init__(self, filename=None, stream=None):
+            self.filename = filename
+            self.stream = stream
+
+    class _Signal:
+        def __init__(self):
+            self._callbacks = []
+
+        def connect(self, callback):
+            self._callbacks.append(callback)
+
+        def fire(self, text, reason):
+            evt = types.SimpleNamespace(result=types.SimpleNamespace(text=text, reason=reason))
+            for callback in self._callbacks:
+                callback(evt)
+
+    class PushAudioInputStream:
+        def __init__(self):
+            self.listener = None
+
+        def write(self, audio):
+            if self.listener is not None:
+                self.listener(audio.decode("utf-8"))
+
+        def close(self):
+            self.listener = None
+
+    class _Future:
+        def __init__(self, fn):
+            self._fn = fn
+
+        def get(self):
+            if latency > 0:
+                time.sleep(latency)
+            return self._fn()
+
+    class SpeechSynthesizer:
+        def __init__(self, speech_config=None, audio_config=None):
+            self.audio_config = audio_config
+
+        def speak_text_async(self, text):
+            def speak():
+                if self.audio_config is not None and self.audio_config.filename:
+                    with open(self.audio_config.filename, "wb") as f:
+                        f.write(FAKE_WAV)
+                return types.SimpleNamespace(reason=_ResultReason.SynthesizingAudioCompleted, audio_data=FAKE_WAV)
+            return _Future(speak)
+
+    class SpeechRecognizer:
+        def __init__(self, speech_config=None, audio_config=None):
+            self.audio_config = audio_config
+            self.recognizing = _Signal()
+            self.recognized = _Signal()
+
+        def recognize_once_async(self):
+            return _Future(lambda: types.SimpleNamespace(reason=_ResultReason.RecognizedSpeech, text=transcript))
+
+        def _on_audio(self, text):
+            if latency > 0:
+                time.sleep(latency)
+            self.recognizing.fire(text.split(" ")[0], _ResultReason.RecognizingSpeech)
+            self.recognized.fire(text, _ResultReason.RecognizedSpeech)
+
+        def start_continuous_recognition_async(self):
+            def start():
+                self.audio_config.stream.listener = self._on_audio
+            return types.SimpleNamespace(get=start)
+
+        def stop_continuous_recognition_async(self):
+            return types.SimpleNamespace(get=lambda: None)
+
+    class Connection:
+        @staticmethod
+        def from_speech_synthesizer(synthesizer):
+            return types.SimpleNamespace(open=lambda for_continuous_recognition: None)
+
+    return types.SimpleNamespace(
+        SpeechConfig=SpeechConfig,
+        Connection=Connection,
+        SpeechSynthesizer=SpeechSynthesizer,
+        SpeechRecognizer=SpeechRecognizer,
+        ResultReason=_ResultReason,
+        SpeechSynthesisOutputFormat=_OutputFormat,
+        audio=types.SimpleNamespace(
+            AudioOutputConfig=AudioOutputConfig,
+            AudioConfig=AudioConfig,
+            PushAudioInputStream=PushAudioInputStream,
+        ),
+    )
+
+
+def fake_convert_to_pcm_wav(input_path: str, output_path: str):
+    """Stand-in for the ffmpeg conversion that just copies the upload."""
+    with open(input_path, "rb") as src, open(output_path, "wb") as dst:
+        dst.write(src.read())
@@ -0,0 +1,352 @@
+"""Offline batch replay of recorded conversations.
+
+Replays recorded sessions through the advisor state machine, without the
+HTTP layer, across a pool of worker processes, and writes one row per turn
+(reply, latency, Gemini time and token counts) to a Parquet file so two
+runs can be compared.
+
+Input is JSONL, one session per line:
+
+    {"state": {...StudentState...}, "utterances": ["I am a junior", ...], "next_step": null}
+
+`state` is the state the session starts from (a fresh one if omitted) and
+`next_step` the step it was waiting on; null starts with the opening
+question. Without `utterances`, the user turns of `state.conversation_history`
+are replayed from a fresh state, so a saved end-of-session state works too.
+A record that fails to parse or validate, or a session that fails outside
+an advisor call, becomes an error row without stopping the run.
+
+LLM backends:
+
+- `stub`: `FakeGeminiClient` canned replies, no network
+- `cache`: only replies recorded in `--cache`; a miss fails the turn
+- `live`: Gemini, recording replies into `--cache` when given
+
+Usage (from the server/ directory):
+
+    python -m benchmarks.replay sessions.jsonl --backend live --cache replay-cache --output before.parquet
+    python -m benchmarks.replay sessions.jsonl --backend cache --cache replay-cache --output after.parquet
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+import types
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional
+
+from dotenv import load_dotenv
+
+# Real credentials from .env win; the placeholder only lets the stub and cache backends start
+load_dotenv()
+os.environ.setdefault("GEMINI_API_KEY", "replay")
+
+import pandas as pd
+from fastapi import HTTPException
+
+from app.config import Config
+from app.helpers.metrics import end_trace, start_trace
+from app.models.student import StudentState
+from app.services.advisor_service import AdvisorService
+from app.services.conversation_service import ConversationService
+from app.services.course_service import course_service
+from benchmarks.fakes import FakeGeminiClient, make_catalog
+
+logger = logging.getLogger(__name__)
+
+
+class CachedGeminiClient:
+    """Serves Gemini replies from a directory of recorded responses.
+
+    Entries are keyed by model, system instruction and prompt. With an
+    `inner` client, misses are forwarded to it and recorded; without one a
+    miss raises LookupError.
+    """
+
+    def __init__(self, cache_dir: str, inner=None):
+        self.cache_dir = cache_dir
+        self.inner = inner
+        os.makedirs(cache_dir, exist_ok=True)
+        self.models = types.SimpleNamespace(generate_content=self.generate_content)
+
+    @staticmethod
+    def key(model: str, contents: List[str], system_instruction: str) -> str:
+        payload = json.dumps([model, system_instruction, contents], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def generate_content(self, model: str, contents: List[str], config: Any = None):
+        system_instruction = getattr(config, "system_instruction", "") or ""
+        path = os.path.join(self.cache_dir, f"{self.key(model, contents, system_instruction)}.json")
+
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            if self.inner is None:
+                raise LookupError(f"No recorded Gemini reply for this {model} prompt")
+            response = self.inner.models.generate_content(model=model, contents=contents, config=config)
+            usage = getattr(response, "usage_metadata", None)
+            entry = {
+                "text": response.candidates[0].content.parts[0].text,
+                "prompt_tokens": getattr(usage, "prompt_token_count", None),
+                "response_tokens": getattr(usage, "candidates_token_count", None),
+            }
+            # Workers share the directory, so write then rename to never expose a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+            return response
+
+        return types.SimpleNamespace(
+            candidates=[types.SimpleNamespace(content=types.SimpleNamespace(parts=[types.SimpleNamespace(text=entry["text"])]))],
+            usage_metadata=types.SimpleNamespace(
+                prompt_token_count=entry["prompt_tokens"], candidates_token_count=entry["response_tokens"]
+            ),
+        )
+
+
+def make_backend(args, live_client=None):
+    """Build the Gemini client for `args.backend`."""
+    if args.backend == "stub":
+        responses = None
+        if args.gemini_responses:
+            with open(args.gemini_responses) as f:
+                responses = json.load(f)
+        return FakeGeminiClient(latency=args.gemini_latency, jitter=args.gemini_jitter, responses=responses)
+    if args.backend == "cache":
+        return CachedGeminiClient(args.cache)
+    if args.cache:
+        return CachedGeminiClient(args.cache, inner=live_client)
+    return live_client
+
+
+def load_catalog(args):
+    """Load the catalog from a JSON export, a synthetic one, or MongoDB."""
+    if args.catalog:
+        with open(args.catalog) as f:
+            course_service.load_courses(json.load(f))
+    elif args.size:
+        course_service.load_courses(make_catalog(args.size, Config.SYNC_TERMS[0], Config.SYNC_SUBJECTS))
+    elif not course_service.load_course_data():
+        raise RuntimeError("Failed to load the course catalog from MongoDB")
+
+
+def load_sessions(path: str) -> List[Dict[str, Any]]:
+    """Read recorded sessions, one JSON object per line.
+
+    An invalid record is kept as a session with an `error`, so it shows up
+    in the results instead of aborting the run.
+    """
+    sessions = []
+    with open(path) as f:
+        for index, line in enumerate(f):
+            if not line.strip():
+                continue
+            try:
+                sessions.append({"index": index, **parse_session(json.loads(line), index)})
+            except (ValueError, TypeError, KeyError, AttributeError) as e:
+                logger.warning(f"Invalid session on line {index + 1}: {e}")
+                sessions.append({"index": index, "error": f"Invalid session record: {e}"})
+    return sessions
+
+
+def parse_session(record: Dict[str, Any], index: int) -> Dict[str, Any]:
+    """Turn one recorded session into the state, utterances and step to replay."""
+    state = record.get("state") or {"session_id": record.get("session_id", f"replay-{index}")}
+    utterances = record.get("utterances")
+    next_step = record.get("next_step")
+    if utterances is None:
+        history = state.get("conversation_history") or []
+        utterances = [entry["message"] for entry in history if entry.get("role") == "user"]
+        state = {"session_id": state["session_id"]}
+        next_step = None
+
+    # Validate now, in the parent, so a bad record fails alone
+    StudentState(**state)
+    if not isinstance(utterances, list) or not all(isinstance(utterance, str) for utterance in utterances):
+        raise ValueError("utterances must be a list of strings")
+    if next_step is not None and not isinstance(next_step, str):
+        raise ValueError("next_step must be a string or null")
+    return {"state": state, "utterances": utterances, "next_step": next_step}
+
+
+# Per-process advisor, set up by _init_worker
+_advisor: Optional[AdvisorService] = None
+
+
+def _init_worker(args):
+    global _advisor
+    logging.basicConfig(level=args.log_level)
+    if args.backend != "live":
+        # Local replies either exist or they don't; retrying a miss only adds backoff
+        Config.GEMINI_MAX_RETRIES = 1
+    load_catalog(args)
+    _advisor = AdvisorService()
+    _advisor.gemini_service.client = make_backend(args, _advisor.gemini_service.client)
+
+
+def error_row(session: Dict[str, Any], turn: int, error: str, step: Optional[str] = None, utterance: Optional[str] = None) -> Dict[str, Any]:
+    """A result row for a turn, or a whole session, that never reached the advisor."""
+    return {
+        "session_index": session["index"],
+        "session_id": (session.get("state") or {}).get("session_id"),
+        "turn": turn,
+        "step": step,
+        "utterance": utterance,
+        "next_step": None,
+        "response_text": None,
+        "error": error,
+        "latency_seconds": None,
+        "gemini_seconds": 0.0,
+        "gemini_calls": 0,
+        "prompt_tokens": 0,
+        "response_tokens": 0,
+    }
+
+
+async def replay_session(session: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Replay one session, returning a row per advisor turn."""
+    if "error" in session:
+        return [error_row(session, 0, session["error"])]
+
+    state = StudentState(**session["state"])
+    next_step = session["next_step"]
+    rows: List[Dict[str, Any]] = []
+
+    async def turn(utterance: Optional[str]) -> bool:
+        nonlocal next_step
+        step = next_step
+        if utterance is not None:
+            ConversationService.apply_user_answer(state, step, utterance)
+
+        trace, token = start_trace()
+        start = time.perf_counter()
+        response, error = None, None
+        try:
+            # The advisor writes to the state it is given; like the web client, keep only its response
+            response = await _advisor.process_next_step(state.model_copy(deep=True))
+        except HTTPException as e:
+            error = str(e.detail)
+        except Exception as e:
+            error = str(e)
+        finally:
+            end_trace(token)
+        latency = time.perf_counter() - start
+
+        gemini_timings = [seconds for stage, seconds in trace.timings if stage.startswith("gemini.")]
+        rows.append({
+            "session_index": session["index"],
+            "session_id": state.session_id,
+            "turn": len(rows),
+            "step": step,
+            "utterance": utterance,
+            "next_step": response.next_step if response else None,
+            "response_text": response.response_text if response else None,
+            "error": error,
+            "latency_seconds": latency,
+            "gemini_seconds": sum(gemini_timings),
+            "gemini_calls": len(gemini_timings),
+            "prompt_tokens": trace.tokens["prompt"],
+            "response_tokens": trace.tokens["response"],
+        })
+        if response is None:
+            return False
+
+        ConversationService.apply_advisor_response(state, response)
+        next_step = response.next_step
+        return next_step != "complete"
+
+    try:
+        if next_step is None and not await turn(None):
+            return rows
+        for utterance in session["utterances"]:
+            if not await turn(utterance):
+                break
+    except Exception as e:
+        # Fail the rest of this session only; its earlier turns still count
+        logger.exception(f"Replay of session {state.session_id} failed")
+        rows.append(error_row(session, len(rows), str(e), step=next_step))
+    finally:
+        _advisor.retry_tracker.pop(state.session_id, None)
+    return rows
+
+
+async def _replay_chunk(sessions: List[Dict[str, Any]], concurrency: int) -> List[Dict[str, Any]]:
+    slots = asyncio.Semaphore(concurrency)
+
+    async def run(session):
+        async with slots:
+            return await replay_session(session)
+
+    results = await asyncio.gather(*(run(session) for session in sessions))
+    return [row for rows in results for row in rows]
+
+
+def replay_chunk(sessions: List[Dict[str, Any]], concurrency: int) -> List[Dict[str, Any]]:
+    """Worker entry point: replay a chunk of sessions."""
+    return asyncio.run(_replay_chunk(sessions, concurrency))
+
+
+def main(args) -> pd.DataFrame:
+    sessions = load_sessions(args.sessions)
+    if not sessions:
+        raise SystemExit(f"No sessions in {args.sessions}")
+    chunks = [sessions[i:i + args.chunk_size] for i in range(0, len(sessions), args.chunk_size)]
+    rows: List[Dict[str, Any]] = []
+    started = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker, initargs=(args,)) as pool:
+        futures = {pool.submit(replay_chunk, chunk, args.concurrency): chunk for chunk in chunks}
+        for done, future in enumerate(as_completed(futures), 1):
+            try:
+                rows.extend(future.result())
+            except Exception as e:
+                # e.g. a worker that died; record its sessions as failed and keep the rest
+                logger.error(f"Replay chunk failed: {e!r}")
+                rows.extend(error_row(session, 0, f"Replay worker failed: {e!r}") for session in futures[future])
+            logger.info(f"Replayed {done}/{len(chunks)} chunks ({time.perf_counter() - started:.1f}s)")
+
+    frame = pd.DataFrame(rows).sort_values(["session_index", "turn"], ignore_index=True)
+    frame.to_parquet(args.output, index=False)
+
+    errors = frame["error"].notna()
+    logger.info(
+        f"Replayed {len(sessions)} sessions, {len(frame)} turns ({int(errors.sum())} failed) "
+        f"in {time.perf_counter() - started:.1f}s; "
+        f"turn latency p50 {frame['latency_seconds'].quantile(0.5):.3f}s, "
+        f"p95 {frame['latency_seconds'].quantile(0.95):.3f}s; "
+        f"{int(frame['prompt_tokens'].sum())} prompt and {int(frame['response_tokens'].sum())} response tokens"
+    )
+    return frame
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("sessions", help="JSONL file of recorded sessions")
+    parser.add_argument("--output", default="replay.parquet", help="Parquet file for the per-turn results")
+    parser.add_argument("--backend", choices=["stub", "cache", "live"], default="stub", help="Where Gemini replies come from")
+    parser.add_argument("--cache", help="Directory of recorded Gemini replies (required for --backend cache)")
+    parser.add_argument("--catalog", help="JSON file of course records; defaults to MongoDB")
+    parser.add_argument("--size", type=int, default=0, help="Use a synthetic catalog of this many sections instead")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument("--concurrency", type=int, default=8, help="Sessions in flight per worker")
+    parser.add_argument("--chunk-size", type=int, default=50, help="Sessions handed to a worker at a time")
+    parser.add_argument("--gemini-latency", type=float, default=0.0, help="Stub Gemini latency per call (s)")
+    parser.add_argument("--gemini-jitter", type=float, default=0.0, help="Uniform +/- jitter on stub latency (s)")
+    parser.add_argument("--gemini-responses", help="JSON file mapping system-instruction substrings to stub replies")
+    parser.add_argument("--log-level", default="INFO")
+    args = parser.parse_args(argv)
+    if args.backend == "cache" and not args.cache:
+        parser.error("--backend cache needs --cache")
+    return args
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    logging.basicConfig(level=args.log_level)
+    main(args)
@@ -0,0 +1,83 @@
+"""Byte size of text-to-speech output per audio format.
+
+Synthesizes typical advisor responses through the live Azure Speech
+service in every enabled format and prints a JSON report of payload sizes
+and their ratio to WAV. Needs AZURE_SPEECH_KEY and AZURE_SPEECH_ENDPOINT.
+
+Usage (from the server/ directory):
+
+    python -m benchmarks.tts_formats --output tts_formats.json
+"""
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from typing import Any, Dict
+
+from app.config import Config, STATIC_SPEECH_PROMPTS
+from app.services.speech_service import speech_service
+
+# Representative advisor replies, from a one-line confirmation up to a full recommendation
+SAMPLE_RESPONSES = {
+    "confirmation": "Got it. Moving to the next question.",
+    "question": STATIC_SPEECH_PROMPTS[0],
+    "follow_up": (
+        "Great, a morning schedule and a software engineering goal give us a lot to work with. "
+        "Which programming topics have you enjoyed most so far, how many credits are you hoping to take, "
+        "and would you rather have lab sections or lecture only?"
+    ),
+    "recommendation": (
+        "I recommend CS 114, Introduction to Computer Science Two, taught by Professor Smith on Monday and "
+        "Wednesday from ten to eleven twenty in the morning, with CRN 12345. It builds directly on CS 113, "
+        "covers the data structures you will use in every software engineering interview, and it fits your "
+        "morning preference perfectly. Would you like more recommendations, or do you have questions about "
+        "this course?"
+    ),
+}
+
+
+async def measure(repeats: int) -> Dict[str, Any]:
+    # Measure real synthesis, not cache hits, without touching the real cache directory
+    Config.TTS_CACHE_DIR = tempfile.mkdtemp(prefix="tts-bench-")
+    Config.TTS_CACHE_MEMORY_BYTES = 0
+    Config.TTS_CACHE_DISK_BYTES = 0
+    speech_service.start()
+    speech_service.ensure_ready()
+
+    results: Dict[str, Any] = {}
+    for name, text in SAMPLE_RESPONSES.items():
+        sizes: Dict[str, Dict[str, float]] = {}
+        for audio_format in Config.TTS_FORMATS:
+            start = time.perf_counter()
+            for _ in range(repeats):
+                audio = await speech_service.synthesize(text, audio_format)
+            sizes[audio_format] = {
+                "bytes": len(audio),
+                "mean_seconds": (time.perf_counter() - start) / repeats,
+            }
+        if "wav" in sizes:
+            for audio_format, entry in sizes.items():
+                entry["ratio_to_wav"] = entry["bytes"] / sizes["wav"]["bytes"]
+        results[name] = {"chars": len(text), "formats": sizes}
+
+    speech_service.stop()
+    return {"formats": Config.TTS_FORMATS, "voice": Config.AZURE_SPEECH_VOICE or "default", "responses": results}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=1, help="Syntheses per response and format")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    report = asyncio.run(measure(args.repeats))
+    output = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
@@ -0,0 +1,124 @@
+"""Voice WebSocket benchmark against local stand-ins.
+
+Runs scripted conversations over /voice/ws with the same fakes as
+`benchmarks.conversations`. The fake recognizer treats each binary frame
+as UTF-8 text, so "audio" frames carry the scripted utterances. Reports
+per-turn latency from the end of the utterance to the first audio chunk
+and to the end of the reply, as JSON.
+
+Usage (from the server/ directory):
+
+    python -m benchmarks.voice --conversations 20 --format ogg --gemini-latency 0.2
+"""
+import argparse
+import json
+import time
+from typing import Any, Dict, List
+
+from starlette.testclient import TestClient
+
+# benchmarks.conversations sets placeholder credentials, so import it before the app
+from benchmarks.conversations import (
+    FOLLOW_UP_QUERIES,
+    SCRIPTED_ANSWERS,
+    git_commit,
+    install_fakes,
+    load_catalog,
+    summarize,
+)
+from app.main import app
+from app.models.student import StudentState
+
+
+def receive_turn(ws) -> Dict[str, Any]:
+    """Read events until the reply audio ends; returns the advisor event and timings."""
+    advisor_event = None
+    first_audio = None
+    while True:
+        message = ws.receive()
+        if message.get("bytes") is not None:
+            if first_audio is None:
+                first_audio = time.perf_counter()
+            continue
+        event = json.loads(message["text"])
+        if event["type"] == "advisor":
+            advisor_event = event
+        elif event["type"] == "error":
+            raise RuntimeError(event["detail"])
+        elif event["type"] == "audio_end":
+            return {"advisor": advisor_event, "first_audio": first_audio, "end": time.perf_counter()}
+
+
+def run_conversation(client: TestClient, conversation_id: str, audio_format: str, latencies: Dict[str, List[float]]):
+    state = StudentState(session_id=conversation_id)
+    follow_ups = iter(FOLLOW_UP_QUERIES)
+    with client.websocket_connect("/voice/ws") as ws:
+        ws.send_json({"type": "start", "state": state.model_dump(mode="json"), "next_step": None, "format": audio_format})
+        assert ws.receive_json()["type"] == "ready"
+        turn = receive_turn(ws)
+
+        while True:
+            next_step = turn["advisor"]["response"]["next_step"]
+            if next_step == "complete":
+                break
+            answer = SCRIPTED_ANSWERS.get(next_step) or next(follow_ups, None)
+            if answer is None:
+                break
+
+            sent = time.perf_counter()
+            ws.send_bytes(answer.encode("utf-8"))
+            turn = receive_turn(ws)
+            latencies.setdefault(f"{next_step}.first_audio", []).append(turn["first_audio"] - sent)
+            latencies.setdefault(f"{next_step}.turn", []).append(turn["end"] - sent)
+
+
+def main(args) -> Dict[str, Any]:
+    install_fakes(args)
+    load_catalog(args.size)
+    latencies: Dict[str, List[float]] = {}
+
+    with TestClient(app) as client:
+        started = time.perf_counter()
+        for i in range(args.conversations):
+            run_conversation(client, f"voice-{i}", args.format, latencies)
+        wall = time.perf_counter() - started
+
+    return {
+        "commit": git_commit(),
+        "config": {
+            "catalog_size": args.size,
+            "conversations": args.conversations,
+            "format": args.format,
+            "gemini_latency": args.gemini_latency,
+            "gemini_slow_rate": args.gemini_slow_rate,
+            "speech_latency": args.speech_latency,
+        },
+        "wall_seconds": wall,
+        "latency": {phase: summarize(values) for phase, values in sorted(latencies.items())},
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=2000, help="Catalog size (sections)")
+    parser.add_argument("--conversations", type=int, default=20, help="Conversations to run, one at a time")
+    parser.add_argument("--format", default="wav", help="Reply audio format (wav, ogg, mp3)")
+    parser.add_argument("--gemini-latency", type=float, default=0.0, help="Fake Gemini latency per call (s)")
+    parser.add_argument("--gemini-jitter", type=float, default=0.0, help="Uniform +/- jitter on Gemini latency (s)")
+    parser.add_argument("--gemini-slow-rate", type=float, default=0.0, help="Fraction of Gemini calls that are slow")
+    parser.add_argument("--gemini-slow-latency", type=float, default=10.0, help="Latency of a slow Gemini call (s)")
+    parser.add_argument("--gemini-responses", help="JSON file mapping system-instruction substrings to replies")
+    parser.add_argument("--speech-latency", type=float, default=0.0, help="Fake Azure Speech latency per call (s)")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    report = main(args)
+    output = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
@@ -0,0 +1,6 @@
+import os
+
+# The app reads credentials at import time; give it placeholders so nothing real is contacted
+os.environ.setdefault("GEMINI_API_KEY", "test")
+os.environ.setdefault("AZURE_SPEECH_KEY", "test")
+os.environ.setdefault("AZURE_SPEECH_ENDPOINT", "https://localhost.invalid/")
@@ -0,0 +1,35 @@
+"""Text-to-speech output format configuration and negotiation."""
+import pytest
+
+from app.config import _parse_tts_formats
+from app.helpers.audio import negotiate_audio_format
+
+ENABLED = ["wav", "ogg", "mp3"]
+
+
+def test_explicit_format_wins_and_accepts_aliases():
+    assert negotiate_audio_format("audio/mpeg", "opus", ENABLED, "wav") == "ogg"
+    assert negotiate_audio_format(None, "flac", ENABLED, "wav") is None
+
+
+def test_accept_header_is_ranked_by_quality():
+    assert negotiate_audio_format("audio/wav;q=0.5, audio/ogg", None, ENABLED, "wav") == "ogg"
+    assert negotiate_audio_format("audio/flac, audio/mpeg;q=0.1", None, ENABLED, "wav") == "mp3"
+    assert negotiate_audio_format("audio/ogg;q=0", None, ENABLED, "mp3") == "mp3"
+
+
+def test_default_falls_back_to_an_enabled_format():
+    enabled = ["ogg", "mp3"]
+
+    assert negotiate_audio_format(None, None, enabled, "wav") == "ogg"
+    assert negotiate_audio_format("*/*", None, enabled, "wav") == "ogg"
+    assert negotiate_audio_format("audio/wav", None, enabled, "wav") == "ogg"
+
+
+def test_configured_formats_must_be_known():
+    assert _parse_tts_formats(" MP3, opus,ogg ,") == ["mp3", "ogg"]
+
+    with pytest.raises(ValueError, match="unknown: flac"):
+        _parse_tts_formats("wav,flac")
+    with pytest.raises(ValueError, match="one or more of wav, ogg, mp3"):
+        _parse_tts_formats(" , ")
@@ -0,0 +1,54 @@
+"""Prompt-sized course selection from a partitioned catalog."""
+from app.config import Config
+from app.services.course_service import PLAN_COURSES, CourseService
+from benchmarks.fakes import make_catalog
+
+TERM = Config.SYNC_TERMS[0]
+
+
+def make_service(size):
+    records = make_catalog(size, TERM, Config.SYNC_SUBJECTS)
+    # A plan-of-study course for each year, in a subject the synthetic catalog fills last
+    records += [
+        {"TERM": TERM, "SUBJECT": "MATH", "COURSE": "MATH 111", "TITLE": "Calculus I", "SECTION": "001", "CRN": "90001"},
+        {"TERM": TERM, "SUBJECT": "CS", "COURSE": "CS 435", "TITLE": "Advanced Data Structures", "SECTION": "001", "CRN": "90002"},
+    ]
+    service = CourseService()
+    service.load_courses(records)
+    return service
+
+
+def test_course_data_is_bounded_by_max_sections():
+    small = make_service(200).get_course_data(max_sections=50)
+    large = make_service(20000).get_course_data(max_sections=50)
+
+    assert small.count("CRN") == 50
+    assert large.count("CRN") == 50
+
+
+def section_codes(course_data):
+    return [section.split(",")[0].replace("Course ", "").replace(" ", "") for section in course_data.split("\n---\n")]
+
+
+def test_course_data_puts_the_students_year_first():
+    service = make_service(20000)
+
+    freshman = section_codes(service.get_course_data("I'm a freshman", max_sections=40))
+    senior = section_codes(service.get_course_data("Senior", max_sections=40))
+
+    for codes, year_courses in ((freshman, PLAN_COURSES[0]), (senior, PLAN_COURSES[3])):
+        in_year = [code in year_courses for code in codes]
+        # Every section of the year's plan courses comes before anything else
+        assert in_year == sorted(in_year, reverse=True)
+        assert in_year[0]
+    assert "MATH111" in freshman
+    assert "CS435" in senior
+
+
+def test_course_data_is_cached_until_the_catalog_reloads():
+    service = make_service(200)
+    first = service.get_course_data("Junior")
+
+    assert service.get_course_data("Junior") is first
+    service.load_courses(make_catalog(10, TERM, ["CS"]))
+    assert service.get_course_data("Junior").count("CRN") == 10
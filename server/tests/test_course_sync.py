@@ -0,0 +1,152 @@
+"""Catalog fetch against a local HTTP stand-in for the Banner export."""
+import json
+import threading
+import time
+import types
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.config import Config
+from app.helpers import njit
+from app.services.course_service import CourseService
+
+TERM = "202590"
+SUBJECTS = ["CS", "MATH", "PHYS", "ENGL", "IS", "IT"]
+
+
+class BannerStandIn:
+    """Serves Banner-shaped JSON for each term/subject export URL.
+
+    `failures` maps a subject to how many requests fail with HTTP 500
+    before it succeeds (-1 fails forever).
+    """
+
+    def __init__(self, failures=None, delay=0.05):
+        self.failures = dict(failures or {})
+        self.delay = delay
+        self.requests = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._routes = {}
+
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stand_in.handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/export"
+
+    def route(self, term, subject):
+        # The export URL is the only thing identifying the source, as with Banner
+        self._routes[njit.build_source_url(term, subject).split("/", 3)[3]] = (term, subject)
+
+    def handle(self, request):
+        term, subject = self._routes[request.path.lstrip("/")]
+        with self._lock:
+            self.requests[subject] = self.requests.get(subject, 0) + 1
+            attempt = self.requests[subject]
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            failures = self.failures.get(subject, 0)
+            if failures == -1 or attempt <= failures:
+                request.send_response(500)
+                request.end_headers()
+                return
+            body = json.dumps([
+                {"COURSE": f"{subject} {100 + i}", "TITLE": f"{subject} Topics", "SECTION": "001", "CRN": f"{subject}{i}"}
+                for i in range(3)
+            ]).encode()
+            request.send_response(200)
+            request.send_header("Content-Type", "application/json")
+            request.send_header("Content-Length", str(len(body)))
+            request.end_headers()
+            request.wfile.write(body)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+@pytest.fixture
+def banner(monkeypatch):
+    def start(**kwargs):
+        stand_in = BannerStandIn(**kwargs)
+        monkeypatch.setattr(Config, "SOURCE_BASE_URL", stand_in.base_url)
+        for subject in SUBJECTS:
+            stand_in.route(TERM, subject)
+        threading.Thread(target=stand_in.server.serve_forever, daemon=True).start()
+        started.append(stand_in)
+        return stand_in
+
+    started = []
+    sleeps = []
+    # Skip the real retry backoff but keep what it would have waited
+    monkeypatch.setattr(njit, "time", types.SimpleNamespace(sleep=sleeps.append))
+    monkeypatch.setattr(Config, "SYNC_FETCH_RETRIES", 3)
+    start.sleeps = sleeps
+    yield start
+    for stand_in in started:
+        stand_in.server.shutdown()
+        stand_in.server.server_close()
+
+
+def test_fetch_bounds_parallelism(banner, monkeypatch):
+    monkeypatch.setattr(Config, "SYNC_MAX_PARALLEL", 2)
+    stand_in = banner()
+
+    records, failed = njit.fetch_course_data([TERM], SUBJECTS)
+
+    assert failed == []
+    assert len(records) == 3 * len(SUBJECTS)
+    assert stand_in.max_in_flight == 2
+
+
+def test_fetch_retries_a_failing_source(banner):
+    stand_in = banner(failures={"MATH": 2})
+
+    records, failed = njit.fetch_course_data([TERM], SUBJECTS)
+
+    assert failed == []
+    assert stand_in.requests["MATH"] == 3
+    assert stand_in.requests["CS"] == 1
+    assert banner.sleeps == [1, 2]
+    assert sum(1 for record in records if record["SUBJECT"] == "MATH") == 3
+
+
+def test_fetch_reports_partial_failure(banner):
+    banner(failures={"IS": -1})
+    progress = []
+
+    records, failed = njit.fetch_course_data([TERM], SUBJECTS, on_source_done=lambda *args: progress.append(args))
+
+    assert failed == [f"IS {TERM}"]
+    assert {record["SUBJECT"] for record in records} == set(SUBJECTS) - {"IS"}
+    assert len(progress) == len(SUBJECTS)
+    assert (f"IS {TERM}", 0, True) in progress
+
+
+def test_fetch_raises_when_every_source_fails(banner):
+    banner(failures={subject: -1 for subject in SUBJECTS})
+
+    with pytest.raises(RuntimeError):
+        njit.fetch_course_data([TERM], SUBJECTS)
+
+
+def test_load_courses_partitions_by_term_and_subject(banner):
+    banner()
+    records, _ = njit.fetch_course_data([TERM], SUBJECTS)
+    service = CourseService()
+
+    service.load_courses(records)
+
+    assert set(service.partitions) == {(TERM, subject) for subject in SUBJECTS}
+    assert len(service.get_partition(TERM, "MATH")) == 3
+    assert service.get_partition(TERM, "BIOL") == []
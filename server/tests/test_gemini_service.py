@@ -0,0 +1,122 @@
+"""Model tiers, hedged requests and fallback with a stub Gemini client."""
+import asyncio
+import time
+import types
+
+import pytest
+from fastapi import HTTPException
+
+from app.config import Config
+from app.services.gemini_service import GeminiService
+
+
+class StubClient:
+    """Answers with "<model>#<call number>" after a latency chosen per call.
+
+    Honors the per-request HTTP timeout, so slow calls end like real ones.
+    """
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.calls = []
+        self.models = types.SimpleNamespace(generate_content=self.generate_content)
+
+    def generate_content(self, model, contents, config):
+        self.calls.append(model)
+        number = len(self.calls)
+        delay = self.latency(model, number)
+        timeout = config.http_options.timeout / 1000
+        time.sleep(min(delay, timeout))
+        if delay > timeout:
+            raise TimeoutError("stub request timed out")
+        part = types.SimpleNamespace(text=f"{model}#{number}")
+        return types.SimpleNamespace(
+            candidates=[types.SimpleNamespace(content=types.SimpleNamespace(parts=[part]))],
+            usage_metadata=None,
+        )
+
+
+@pytest.fixture
+def gemini(monkeypatch):
+    monkeypatch.setattr(Config, "GEMINI_MODEL_TIERS", {
+        "fast": {"model": "lite", "timeout": 0.5, "hedge_after": 0.1},
+        "standard": {"model": "flash", "timeout": 0.8, "hedge_after": 0.3},
+    })
+    monkeypatch.setattr(Config, "GEMINI_HTTP_TIMEOUT_GRACE", 0.1)
+
+    def make(latency):
+        service = GeminiService()
+        service.client = StubClient(latency)
+        return service
+    return make
+
+
+def call(service, call_site="validate_answer", max_retries=None):
+    async def run():
+        start = time.perf_counter()
+        text = await service.call_with_retry("prompt", "system", max_retries=max_retries, call_site=call_site)
+        return text, time.perf_counter() - start
+    return asyncio.run(run())
+
+
+def test_call_site_picks_its_tier(gemini):
+    service = gemini(lambda model, number: 0.0)
+
+    assert call(service, "validate_answer")[0] == "lite#1"
+    assert call(service, "first_recommendation")[0] == "flash#2"
+    assert call(service, "unlisted")[0] == "flash#3"
+
+
+def test_hedge_wins_over_a_slow_first_attempt(gemini):
+    service = gemini(lambda model, number: 0.4 if number == 1 else 0.01)
+
+    text, elapsed = call(service)
+
+    assert text == "lite#2"
+    assert elapsed < 0.4
+    assert service.client.calls == ["lite", "lite"]
+    # The cancelled loser still counts, at least as long as it was waited on
+    assert len(service.latencies["fast"]) == 2
+    assert max(service.latencies["fast"]) >= 0.1
+
+
+def test_fallback_tier_answers_when_the_tier_times_out(gemini):
+    service = gemini(lambda model, number: 5.0 if model == "lite" else 0.01)
+
+    text, elapsed = call(service)
+
+    assert text == "flash#3"
+    assert service.client.calls == ["lite", "lite", "flash"]
+    assert 0.5 <= elapsed < 1.0
+    # Both timed-out attempts are recorded for the hedge percentile; the hedge started
+    # about 0.1s in, so it was abandoned after just under 0.4s
+    assert len([seconds for seconds in service.latencies["fast"] if seconds >= 0.3]) == 2
+
+
+def test_retry_after_both_tiers_time_out(gemini):
+    service = gemini(lambda model, number: 5.0 if number <= 4 else 0.01)
+
+    text, _ = call(service, max_retries=2)
+
+    assert service.client.calls == ["lite", "lite", "flash", "flash", "lite"]
+    assert text == "lite#5"
+
+
+def test_gives_up_after_the_last_retry(gemini):
+    service = gemini(lambda model, number: 5.0)
+
+    with pytest.raises(HTTPException) as error:
+        call(service, max_retries=1)
+
+    assert "timed out" in error.value.detail
+
+
+def test_hedge_delay_follows_recent_p95(gemini, monkeypatch):
+    monkeypatch.setattr(Config, "GEMINI_HEDGE_MIN_SAMPLES", 20)
+    service = gemini(lambda model, number: 0.0)
+
+    assert service.hedge_delay("fast") == 0.1
+    service.latencies["fast"].extend([0.01] * 19 + [2.0])
+    assert service.hedge_delay("fast") == 0.01
+    service.latencies["fast"].extend([2.0] * 5)
+    assert service.hedge_delay("fast") == 2.0
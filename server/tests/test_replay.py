@@ -0,0 +1,52 @@
+"""Offline replay with the stub Gemini backend, in-process."""
+import json
+
+import pytest
+
+from app.config import Config
+from app.services.advisor_service import AdvisorService
+from app.services.course_service import course_service
+from benchmarks import replay
+from benchmarks.fakes import FakeGeminiClient, make_catalog
+
+
+class RecordingAdvisor(AdvisorService):
+    """Keeps the conversation history of every state it is asked about."""
+
+    def __init__(self):
+        super().__init__()
+        self.gemini_service.client = FakeGeminiClient()
+        self.histories = []
+
+    async def process_next_step(self, state):
+        self.histories.append([entry["message"] for entry in state.conversation_history])
+        return await super().process_next_step(state)
+
+
+@pytest.fixture
+def advisor(monkeypatch):
+    course_service.load_courses(make_catalog(200, Config.SYNC_TERMS[0], Config.SYNC_SUBJECTS))
+    advisor = RecordingAdvisor()
+    monkeypatch.setattr(replay, "_advisor", advisor)
+    return advisor
+
+
+def test_replay_records_bad_sessions_and_keeps_the_rest(advisor, tmp_path):
+    answers = ["I am a junior", "Mornings", "Data science", "I like AI", "Can you suggest another course", "Is it hard"]
+    path = tmp_path / "sessions.jsonl"
+    path.write_text("\n".join([
+        json.dumps({"state": {"session_id": "good"}, "utterances": answers}),
+        json.dumps({"state": {"session_id": "bad", "year": 123}, "utterances": ["hi"]}),
+        "not json",
+    ]))
+
+    sessions = replay.load_sessions(str(path))
+    rows = replay.replay_chunk(sessions, concurrency=2)
+
+    good = [row for row in rows if row["session_index"] == 0]
+    assert [row["error"] for row in good] == [None] * (len(answers) + 1)
+    assert good[-1]["next_step"] == "continuous_conversation"
+    assert [row["session_index"] for row in rows if row["error"]] == [1, 2]
+
+    # Each answer reaches the advisor once, as it would from the web client
+    assert advisor.histories[-1][1::2] == answers
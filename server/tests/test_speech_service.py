@@ -0,0 +1,61 @@
+"""Speech pools with the fake speech SDK."""
+import asyncio
+import importlib
+import threading
+import time
+
+from app.config import Config
+from app.services.speech_service import SpeechService
+from benchmarks.fakes import make_speech_sdk
+
+
+def test_cancelled_synthesis_keeps_its_synthesizer_until_the_call_ends(monkeypatch, tmp_path):
+    sdk = make_speech_sdk(latency=0.3)
+    calls = {"running": 0, "most": 0}
+    lock = threading.Lock()
+
+    class CountingSynthesizer(sdk.SpeechSynthesizer):
+        def speak_text_async(self, text):
+            future = super().speak_text_async(text)
+            get = future.get
+
+            def counted_get():
+                with lock:
+                    calls["running"] += 1
+                    calls["most"] = max(calls["most"], calls["running"])
+                try:
+                    return get()
+                finally:
+                    with lock:
+                        calls["running"] -= 1
+
+            future.get = counted_get
+            return future
+
+    sdk.SpeechSynthesizer = CountingSynthesizer
+    # `app.services` re-exports the instance under the module's name, so fetch the module itself
+    monkeypatch.setattr(importlib.import_module("app.services.speech_service"), "speechsdk", sdk)
+    monkeypatch.setattr(Config, "TTS_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(Config, "SPEECH_POOL_SIZE", 1)
+
+    async def run():
+        service = SpeechService()
+        service.start()
+        try:
+            # Barge-in: cancel a synthesis while its SDK call is running
+            first = asyncio.create_task(service.synthesize("First reply"))
+            await asyncio.sleep(0.1)
+            first.cancel()
+            await asyncio.gather(first, return_exceptions=True)
+
+            start = time.perf_counter()
+            await service.synthesize("Second reply")
+            return time.perf_counter() - start
+        finally:
+            service.stop()
+
+    elapsed = asyncio.run(run())
+
+    assert calls["most"] == 1
+    # The second call waited for the first to finish on the only synthesizer
+    assert elapsed >= 0.45
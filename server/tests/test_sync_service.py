@@ -0,0 +1,136 @@
+"""Background course syncs against mongomock, with the NJIT fetch faked."""
+import importlib
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI
+from starlette.testclient import TestClient
+
+from app.config import Config
+from app.helpers import mongo
+from app.routes import courses
+from app.services.course_service import course_service
+from benchmarks.fakes import make_catalog, make_collection
+
+# `app.services` re-exports the instance under the module's name, so fetch the module itself
+sync_module = importlib.import_module("app.services.sync_service")
+
+
+class FakeFetch:
+    """Stands in for fetch_course_data, holding each call until released."""
+
+    def __init__(self, records, error=None):
+        self.records = records
+        self.error = error
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, on_source_done=None):
+        self.started.set()
+        assert self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        for term in Config.SYNC_TERMS:
+            for subject in Config.SYNC_SUBJECTS:
+                count = sum(record["TERM"] == term and record["SUBJECT"] == subject for record in self.records)
+                on_source_done(f"{subject} {term}", count, False)
+        return self.records, []
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(mongo, "collection", make_collection())
+    service = sync_module.SyncService()
+    monkeypatch.setattr(courses, "sync_service", service)
+    yield service
+    service.stop()
+
+
+@pytest.fixture
+def client(service):
+    app = FastAPI()
+    app.include_router(courses.router)
+    return TestClient(app)
+
+
+def wait_until_finished(service, job_id):
+    deadline = time.monotonic() + 5
+    while service.get_job(job_id).finished_at is None:
+        assert time.monotonic() < deadline, "sync job did not finish"
+        time.sleep(0.01)
+    return service.get_job(job_id)
+
+
+def test_sync_runs_once_and_reloads_the_catalog(service, client, monkeypatch):
+    records = make_catalog(60, Config.SYNC_TERMS[0], Config.SYNC_SUBJECTS)
+    fetch = FakeFetch(records)
+    monkeypatch.setattr(sync_module, "fetch_course_data", fetch)
+    course_service.load_courses([])
+
+    # Hold the worker so the job is seen while still queued
+    with service._writer_lock:
+        response = client.post("/courses/sync")
+        assert response.status_code == 202
+        job = response.json()
+        assert job["status"] == "queued"
+        assert client.get(f"/courses/sync/{job['job_id']}").json()["status"] == "queued"
+
+    assert fetch.started.wait(5)
+    running = client.get(f"/courses/sync/{job['job_id']}").json()
+    assert (running["status"], running["stage"]) == ("running", "fetching")
+    assert running["started_at"] is not None
+
+    # A trigger while the sync runs gets the same job back
+    overlapping = client.post("/courses/sync")
+    assert overlapping.status_code == 202
+    assert overlapping.json()["job_id"] == job["job_id"]
+
+    fetch.release.set()
+    wait_until_finished(service, job["job_id"])
+    finished = client.get(f"/courses/sync/{job['job_id']}").json()
+
+    assert (finished["status"], finished["stage"], finished["error"]) == ("succeeded", None, None)
+    for timing in ("fetch_seconds", "upsert_seconds", "reload_seconds", "duration_seconds"):
+        assert finished[timing] is not None and finished[timing] >= 0
+    assert finished["sources_total"] == finished["sources_done"] == len(Config.SYNC_TERMS) * len(Config.SYNC_SUBJECTS)
+    assert finished["records_fetched"] == finished["records_synced"] == finished["courses_loaded"] == len(records)
+    assert len(course_service.get_courses_json()) == len(records)
+
+    # Once it has finished, the next trigger starts a new job
+    next_job = client.post("/courses/sync").json()
+    assert next_job["job_id"] != job["job_id"]
+    wait_until_finished(service, next_job["job_id"])
+
+
+def test_failed_sync_records_the_error_and_keeps_the_catalog(service, monkeypatch):
+    fetch = FakeFetch([], error=RuntimeError("NJIT is down"))
+    fetch.release.set()
+    monkeypatch.setattr(sync_module, "fetch_course_data", fetch)
+    catalog = make_catalog(10, Config.SYNC_TERMS[0], Config.SYNC_SUBJECTS)
+    course_service.load_courses(catalog)
+
+    job = wait_until_finished(service, service.start_sync().job_id)
+
+    assert (job.status, job.stage, job.error) == ("failed", "fetching", "NJIT is down")
+    assert job.duration_seconds is not None
+    assert job.upsert_seconds is None and job.reload_seconds is None
+    assert course_service.get_courses_json() == catalog
+    next_job = service.start_sync()
+    assert next_job.job_id != job.job_id
+    wait_until_finished(service, next_job.job_id)
+
+
+def test_unknown_job_is_not_found(client):
+    response = client.get("/courses/sync/missing")
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Sync job missing not found"
+
+
+def test_sync_after_stop_does_not_leave_a_phantom_job(service):
+    service.stop()
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            service.start_sync()
+    assert not service.jobs
@@ -0,0 +1,34 @@
+"""Disk tier of the text-to-speech cache."""
+import os
+
+from app.services.tts_cache import TTSCache
+
+
+def test_put_leaves_only_complete_entries(tmp_path):
+    cache = TTSCache(str(tmp_path), memory_bytes=0, disk_bytes=1024)
+    key = TTSCache.make_key("Hello  there", None, "wav")
+
+    cache.put(key, b"audio")
+
+    assert os.listdir(tmp_path) == [f"{key}.audio"]
+    assert TTSCache(str(tmp_path), memory_bytes=0).get(key) == b"audio"
+
+
+def test_unfinished_writes_are_discarded_on_start(tmp_path):
+    (tmp_path / "partial.tmp").write_bytes(b"trunc")
+
+    cache = TTSCache(str(tmp_path))
+
+    assert os.listdir(tmp_path) == []
+    assert cache.get("partial") is None
+
+
+def test_disk_tier_evicts_least_recently_used(tmp_path):
+    cache = TTSCache(str(tmp_path), memory_bytes=0, disk_bytes=10)
+
+    cache.put("a", b"12345")
+    cache.put("b", b"12345")
+    cache.get("a")
+    cache.put("c", b"12345")
+
+    assert sorted(os.listdir(tmp_path)) == ["a.audio", "c.audio"]
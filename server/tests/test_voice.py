@@ -0,0 +1,180 @@
+"""Voice pipeline driven with the fake speech SDK and Gemini client."""
+import asyncio
+import importlib
+
+import pytest
+from fastapi import FastAPI
+from starlette.testclient import TestClient
+
+from app.config import Config
+from app.models.student import AdvisorResponse, StudentState
+from app.routes import voice
+from app.services.advisor_service import AdvisorService
+from app.services.course_service import course_service
+from app.services.speech_service import SpeechService
+from app.services.voice_service import VoiceSession
+from benchmarks.fakes import FAKE_WAV, FakeGeminiClient, make_catalog, make_speech_sdk
+
+
+@pytest.fixture
+def speech(monkeypatch, tmp_path):
+    # `app.services` re-exports the instance under the module's name, so fetch the module itself
+    monkeypatch.setattr(importlib.import_module("app.services.speech_service"), "speechsdk", make_speech_sdk())
+    monkeypatch.setattr(Config, "TTS_CACHE_DIR", str(tmp_path))
+    service = SpeechService()
+    service.start()
+    yield service
+    service.stop()
+
+
+@pytest.fixture
+def advisor():
+    course_service.load_courses(make_catalog(200, Config.SYNC_TERMS[0], Config.SYNC_SUBJECTS))
+    service = AdvisorService()
+    service.gemini_service.client = FakeGeminiClient()
+    return service
+
+
+class SlowAdvisor:
+    """Answers every step once released, recording the answers it was asked about."""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.years = []
+
+    async def process_next_step(self, state):
+        self.years.append(state.year)
+        await self.release.wait()
+        return AdvisorResponse(next_step="time_preference", response_text="Noted.")
+
+
+class Client:
+    """Collects what a VoiceSession sends."""
+
+    def __init__(self):
+        self.events = asyncio.Queue()
+
+    async def send_json(self, event):
+        await self.events.put(event)
+
+    async def send_bytes(self, audio):
+        await self.events.put(audio)
+
+    async def next_event(self, kind):
+        """Skip ahead to the next JSON event of `kind`, counting audio bytes on the way."""
+        self.audio_bytes = 0
+        while True:
+            event = await asyncio.wait_for(self.events.get(), 5)
+            if isinstance(event, bytes):
+                self.audio_bytes += len(event)
+            elif event["type"] == "error":
+                raise AssertionError(event["detail"])
+            elif event["type"] == kind:
+                return event
+
+
+def test_session_runs_a_conversation(speech, advisor):
+    async def run():
+        client = Client()
+        session = VoiceSession(StudentState(session_id="voice-test"), client.send_json, client.send_bytes, advisor, speech)
+        await session.start()
+        assert (await client.next_event("ready"))["format"] == Config.TTS_DEFAULT_FORMAT
+
+        steps = [(await client.next_event("advisor"))["response"]["next_step"]]
+        for answer in ["I am a freshman", "Mornings please", "Software engineering", "I like programming"]:
+            await client.next_event("audio_end")
+            assert client.audio_bytes == len(FAKE_WAV)
+            session.feed_audio(answer.encode("utf-8"))
+            assert (await client.next_event("transcript"))["text"] == answer
+            steps.append((await client.next_event("advisor"))["response"]["next_step"])
+
+        await session.close()
+        return steps, session.state
+
+    steps, state = asyncio.run(run())
+
+    assert steps == ["year", "time_preference", "career_goals", "follow_up_response", "first_recommendation_given"]
+    assert state.year == "I am a freshman"
+    assert state.conversation_phase == "continuous_recommendations"
+
+
+
+def test_free_form_turns_record_each_message_once(speech, advisor):
+    async def run():
+        client = Client()
+        session = VoiceSession(StudentState(session_id="voice-test"), client.send_json, client.send_bytes, advisor, speech)
+        await session.start()
+        await client.next_event("advisor")
+
+        answers = ["I am a freshman", "Mornings please", "Software engineering", "I like programming",
+                   "Can you suggest another course", "Is it hard"]
+        for answer in answers:
+            await client.next_event("audio_end")
+            session.feed_audio(answer.encode("utf-8"))
+            event = await client.next_event("advisor")
+
+        await session.close()
+        return answers, event, session.state
+
+    answers, event, state = asyncio.run(run())
+
+    assert event["response"]["next_step"] == "continuous_conversation"
+    assert event["state"] == state.model_dump(mode="json")
+    # The opening question, then each answer and its reply exactly once
+    history = state.conversation_history
+    assert [entry["role"] for entry in history] == ["advisor"] + ["user", "advisor"] * len(answers)
+    assert [entry["message"] for entry in history if entry["role"] == "user"] == answers
+
+def test_barge_in_before_the_reply_keeps_state_and_merges_the_answer(speech):
+    async def run():
+        client = Client()
+        advisor = SlowAdvisor()
+        session = VoiceSession(
+            StudentState(session_id="voice-test"), client.send_json, client.send_bytes, advisor, speech, next_step="year"
+        )
+        await session.start()
+        await client.next_event("ready")
+
+        # The student pauses mid-answer, so recognition returns two final segments
+        session.feed_audio(b"I am a")
+        await client.next_event("transcript")
+        session.feed_audio(b"junior")
+        await client.next_event("cancelled")
+        assert session.state.year is None
+        assert session.next_step == "year"
+
+        await client.next_event("transcript")
+        advisor.release.set()
+        event = await client.next_event("advisor")
+        await session.close()
+        return advisor.years, event, session
+
+    years, event, session = asyncio.run(run())
+
+    assert years == ["I am a", "I am a junior"]
+    assert event["state"]["year"] == "I am a junior"
+    assert session.state.year == "I am a junior"
+    assert session.next_step == "time_preference"
+
+
+def test_websocket_rejects_malformed_messages(speech, monkeypatch):
+    monkeypatch.setattr(voice, "speech_service", speech)
+    monkeypatch.setattr(voice, "advisor_service", SlowAdvisor())
+    app = FastAPI()
+    app.include_router(voice.router)
+    client = TestClient(app)
+
+    with client.websocket_connect("/voice/ws") as ws:
+        ws.send_json(["not", "an", "object"])
+        assert ws.receive_json()["type"] == "error"
+
+    with client.websocket_connect("/voice/ws") as ws:
+        ws.send_json({"type": "start", "state": {"session_id": "voice-test"}, "next_step": "year"})
+        assert ws.receive_json()["type"] == "ready"
+        ws.send_text("{not json")
+        assert ws.receive_json()["type"] == "error"
+        ws.send_text("[1, 2]")
+        assert ws.receive_json()["type"] == "error"
+        # The session survives bad frames
+        ws.send_json({"type": "bogus"})
+        assert ws.receive_json()["detail"] == "Unknown message type 'bogus'"